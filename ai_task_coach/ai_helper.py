@@ -2,20 +2,84 @@
 Author: Hyunjoo Shim (NUID: 002505607)
 ai_helper.py
 Connects to Gemini AI to break down a goal into small tasks.
+
+abreak_down_goal() and avalidate_goal() are the asyncio versions. Each
+call has a deadline, and a request that takes longer than most recent
+ones (hedge_percentile) gets a duplicate sent alongside it; the first
+usable answer wins and the other request is cancelled. With a deadline
+set, break_down_goal() and validate_goal() run these for sync callers.
 """
 
+import asyncio
+import concurrent.futures
+import inspect
+from collections import deque
 import google.generativeai as genai
-from config import GEMINI_API_KEY
+from config import AI_CACHE_DIR, AI_CACHE_TTL, AI_DEADLINE, GEMINI_API_KEY
+from goal_classifier import GoalClassifier
+from response_cache import ResponseCache, make_key
 from task import Task
 
+# What the combined prompt (validate_and_break_down) answers for a non-goal
+INVALID_GOAL_REPLY = "INVALID"
+
+# Hedging: send a duplicate request once the first takes longer than this
+# share of recent calls did (DEFAULT_HEDGE_DELAY seconds until there
+# are LATENCY_MIN_SAMPLES of them)
+DEFAULT_HEDGE_PERCENTILE = 0.95
+DEFAULT_HEDGE_DELAY = 5.0
+LATENCY_SAMPLES = 100
+LATENCY_MIN_SAMPLES = 10
+
+
+class InvalidGoalError(Exception):
+    """Raised by stream_break_down_goal(validate=True) when the input isn't a goal."""
+
 
 class AIHelper:
-    def __init__(self, model=None):
+    def __init__(
+        self,
+        model=None,
+        cache=None,
+        goal_classifier=None,
+        deadline=None,
+        hedge_delay=None,
+        hedge_percentile=DEFAULT_HEDGE_PERCENTILE,
+    ):
         """
         Set up connection to Gemini AI with injectable model.
 
         :param model: AI model instance for testing (default: Gemini)
+        :param cache: ResponseCache for breakdowns (default: one set up from
+            config.py when using Gemini, none for an injected model)
+        :param goal_classifier: GoalClassifier that settles obvious goals
+            without the AI (default: a new one when using Gemini, none for
+            an injected model)
+        :param deadline: seconds before a call gives up (default: AI_DEADLINE
+            from config.py when using Gemini, no limit for an injected model)
+        :param hedge_delay: seconds before a duplicate request is sent
+            (None: the hedge_percentile of recent call times)
+        :param hedge_percentile: share of recent calls (0-1) a request may
+            be slower than before it is hedged
         """
+        if model is None and cache is None:
+            cache = ResponseCache(AI_CACHE_DIR or None, ttl=AI_CACHE_TTL)
+        self.cache = cache
+        if model is None and goal_classifier is None:
+            goal_classifier = GoalClassifier()
+        self.goal_classifier = goal_classifier
+        if model is None and deadline is None:
+            deadline = AI_DEADLINE
+        self.deadline = deadline
+        self.hedge_delay = hedge_delay
+        self.hedge_percentile = hedge_percentile
+
+        # Seconds taken by recent successful calls, for the hedge delay
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        # Threads for models without a native async call. Our own pool, so
+        # a hedged-away request still running doesn't hold up asyncio.run()
+        self._executor = None
+
         if model is None:
             if not GEMINI_API_KEY:
                 raise ValueError(
@@ -39,12 +103,33 @@ class AIHelper:
     def validate_goal(self, goal):
         """
         Check if the goal is meaningful and actionable.
+        Obvious cases are decided locally; only unclear ones ask the AI.
 
         :param goal: the user's input
         :return: True if valid goal, False if gibberish/unclear
         :raises: Exception if AI call fails
         """
-        prompt = f"""
+        if self.deadline is not None:
+            return self._run_sync(self.avalidate_goal(goal))
+
+        if self.goal_classifier is not None:
+            decision = self.goal_classifier.classify(goal)
+            if decision is not None:
+                return decision
+
+        response = self._call_ai(self._build_validate_prompt(goal))
+        valid = bool(response and "YES" in response.upper())
+        self._remember_goal(goal, valid)
+        return valid
+
+    def _build_validate_prompt(self, goal):
+        """
+        Build the YES/NO prompt for validate_goal().
+
+        :param goal: the user's input
+        :return: prompt string
+        """
+        return f"""
         Is the following a clear, actionable goal or task that someone might want to accomplish?
         
         Input: "{goal}"
@@ -53,34 +138,439 @@ class AIHelper:
         Reply with only "NO" if it's gibberish, random characters, single letters, or doesn't make sense as a task.
         """
 
-        response = self._call_ai(prompt)
-        if response and "YES" in response.upper():
-            return True
-        return False
-
-    def break_down_goal(self, goal, time_available, adjust=None, focus=None, retries=3):
+    def break_down_goal(
+        self,
+        goal,
+        time_available,
+        adjust=None,
+        focus=None,
+        retries=3,
+        use_cache=True,
+    ):
         """
         Break down a goal (big task) into small tasks.
+        The same request answered before comes from the cache instead of the AI.
 
         :param goal: the big goal from user
         :param time_available: how many minutes user has right now
         :param adjust: adjustment type ("too_hard", "not_enough", "different_focus", or None)
         :param focus: specific focus area when adjust="different_focus"
         :param retries: number of attempts
+        :param use_cache: False to always ask the AI (e.g. "regenerate");
+            the new answer still replaces the cached one
         :return: list of Task objects, or None if all retries fail
         :raises: Exception if all retries fail with API errors
+        :raises TimeoutError: if a deadline is set and passes first
+        """
+        if self.deadline is not None:
+            return self._run_sync(
+                self.abreak_down_goal(
+                    goal, time_available, adjust, focus, retries, use_cache
+                )
+            )
+
+        key = None
+        if self.cache is not None:
+            key = make_key(goal, time_available, adjust, focus)
+            if use_cache:
+                tasks = self.cache.get(key)
+                if tasks:
+                    return tasks
+
+        prompt = self._build_prompt(goal, time_available, adjust, focus)
+        tasks = self._request_tasks(prompt, time_available, retries)
+        if tasks and key is not None:
+            self.cache.put(key, tasks)
+        return tasks
+
+    async def abreak_down_goal(
+        self,
+        goal,
+        time_available,
+        adjust=None,
+        focus=None,
+        retries=3,
+        use_cache=True,
+        deadline=None,
+    ):
+        """
+        Async break_down_goal(), with a deadline and hedged requests.
+
+        :param goal: the big goal from user
+        :param time_available: how many minutes user has right now
+        :param adjust: adjustment type ("too_hard", "not_enough", "different_focus", or None)
+        :param focus: specific focus area when adjust="different_focus"
+        :param retries: number of attempts
+        :param use_cache: False to always ask the AI (e.g. "regenerate")
+        :param deadline: seconds for the whole call, retries included
+            (None: the helper's deadline)
+        :return: list of Task objects, or None if all retries fail
+        :raises: Exception if all retries fail with API errors
+        :raises TimeoutError: if the deadline passes first
+        """
+        key = None
+        if self.cache is not None:
+            key = make_key(goal, time_available, adjust, focus)
+            if use_cache:
+                tasks = self.cache.get(key)
+                if tasks:
+                    return tasks
+
+        prompt = self._build_prompt(goal, time_available, adjust, focus)
+
+        async def attempts():
+            last_error = None
+            for attempt in range(retries):
+                try:
+                    # An empty list is no use - let the other request answer
+                    tasks = await self._ahedged(
+                        prompt, lambda text: self._parse_response(text) or None
+                    )
+                except Exception as e:
+                    last_error = e
+                    continue
+                if tasks:
+                    return self._fit_tasks_to_time(tasks, time_available)
+
+            if last_error:
+                raise Exception(
+                    f"Failed to break down goal after {retries} attempts: {str(last_error)}"
+                )
+            return None
+
+        tasks = await self._with_deadline(attempts(), deadline)
+        if tasks and key is not None:
+            self.cache.put(key, tasks)
+        return tasks
+
+    async def avalidate_goal(self, goal, deadline=None):
         """
+        Async validate_goal(), with a deadline and hedged requests.
 
+        :param goal: the user's input
+        :param deadline: seconds for the whole call (None: the helper's deadline)
+        :return: True if valid goal, False if gibberish/unclear
+        :raises: Exception if AI call fails
+        :raises TimeoutError: if the deadline passes first
+        """
+        if self.goal_classifier is not None:
+            decision = self.goal_classifier.classify(goal)
+            if decision is not None:
+                return decision
+
+        valid = await self._with_deadline(
+            self._ahedged(
+                self._build_validate_prompt(goal),
+                lambda text: "YES" in text.upper(),
+            ),
+            deadline,
+        )
+        valid = bool(valid)
+        self._remember_goal(goal, valid)
+        return valid
+
+    async def _with_deadline(self, coroutine, deadline):
+        """
+        Await a coroutine, giving up after the deadline.
+
+        :param coroutine: coroutine to await
+        :param deadline: seconds (None: the helper's deadline, which may be None)
+        :return: the coroutine's result
+        :raises TimeoutError: if the deadline passes first
+        """
+        if deadline is None:
+            deadline = self.deadline
+        try:
+            return await asyncio.wait_for(coroutine, deadline)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No AI answer within {deadline} seconds")
+
+    async def _ahedged(self, prompt, parse):
+        """
+        Send a prompt, plus a duplicate if the first is slower than usual,
+        and use whichever gives a usable answer first. The other request
+        is cancelled.
+
+        :param prompt: the prompt string to send
+        :param parse: function from response text to a result (None if unusable)
+        :return: the first usable result, or None if no answer was usable
+        :raises: Exception if every request failed
+        """
+        loop = asyncio.get_running_loop()
+
+        async def request():
+            started = loop.time()
+            text = await self._acall_ai(prompt)
+            self._latencies.append(loop.time() - started)
+            return None if text is None else parse(text)
+
+        pending = {asyncio.ensure_future(request())}
+        hedged = False
+        last_error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=None if hedged else self._hedge_delay(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    # Slower than usual - race a second request against it
+                    pending.add(asyncio.ensure_future(request()))
+                    hedged = True
+                    continue
+
+                for finished in done:
+                    try:
+                        result = finished.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    if result is not None:
+                        return result
+                if not hedged:
+                    break  # Answered quickly but unusable - the caller retries
+        finally:
+            for unfinished in pending:
+                unfinished.cancel()
+
+        if last_error:
+            raise last_error
+        return None
+
+    def _hedge_delay(self):
+        """
+        Get how long to wait for an answer before sending a duplicate.
+
+        :return: seconds
+        """
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        if len(self._latencies) < LATENCY_MIN_SAMPLES:
+            return DEFAULT_HEDGE_DELAY
+        ordered = sorted(self._latencies)
+        position = min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile))
+        return ordered[position]
+
+    async def _acall_ai(self, prompt):
+        """
+        Async _call_ai(). Uses the model's own async call if it has one,
+        otherwise runs the blocking call in a worker thread.
+
+        :param prompt: the prompt string to send
+        :return: response text, or None if something goes wrong
+        """
+        generate = getattr(self.model, "generate_content_async", None)
+        if not inspect.iscoroutinefunction(generate):
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    thread_name_prefix="ai-call"
+                )
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._call_ai, prompt)
+
+        try:
+            return self._response_text(await generate(prompt))
+        except Exception as e:
+            print(f"Error calling AI: {type(e).__name__}: {str(e)}")
+            raise Exception(f"AI API call failed: {str(e)}") from e
+
+    def _run_sync(self, coroutine):
+        """
+        Run a coroutine from sync code and wait for its result.
+
+        :param coroutine: coroutine to run
+        :return: the coroutine's result
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # Already inside an event loop - run it on a loop of its own
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coroutine).result()
+
+    def validate_and_break_down(self, goal, time_available, retries=3):
+        """
+        Check a new goal and break it down with one AI call instead of
+        validate_goal() followed by break_down_goal().
+
+        :param goal: the user's input
+        :param time_available: how many minutes user has right now
+        :param retries: number of attempts
+        :return: (valid, tasks) - (False, None) if it isn't a goal,
+            otherwise (True, list of Task objects, or None if all retries fail)
+        :raises: Exception if all retries fail with API errors
+        """
+        if self.goal_classifier is not None:
+            decision = self.goal_classifier.classify(goal)
+            if decision is False:
+                return False, None
+            if decision:
+                # Already known to be a goal - a plain (maybe cached) breakdown
+                return True, self.break_down_goal(goal, time_available, retries=retries)
+
+        key = None
+        if self.cache is not None:
+            key = make_key(goal, time_available)
+            tasks = self.cache.get(key)
+            if tasks:
+                return True, tasks  # Only goals get cached
+
+        prompt = self._build_prompt(goal, time_available, validate=True)
+        tasks = self._request_tasks(prompt, time_available, retries, allow_invalid=True)
+
+        valid = tasks is not False
+        self._remember_goal(goal, valid)
+        if not valid:
+            return False, None
+        if tasks and key is not None:
+            self.cache.put(key, tasks)
+        return True, tasks
+
+    def stream_break_down_goal(
+        self,
+        goal,
+        time_available,
+        adjust=None,
+        focus=None,
+        validate=False,
+        use_cache=True,
+        retries=3,
+    ):
+        """
+        Break down a goal, handing out each task as soon as the AI has
+        written its line, so the first step can be shown right away.
+
+        Minutes are fitted to time_available once the answer is complete,
+        so the yielded tasks' timer_minutes may change when the generator
+        finishes. If streaming gives no usable steps, falls back to
+        break_down_goal()'s retries.
+
+        :param goal: the big goal from user
+        :param time_available: how many minutes user has right now
+        :param adjust: adjustment type ("too_hard", "not_enough", "different_focus", or None)
+        :param focus: specific focus area when adjust="different_focus"
+        :param validate: also check the goal, in the same AI call
+        :param use_cache: False to always ask the AI (e.g. "regenerate")
+        :param retries: attempts for the fallback
+        :return: generator of Task objects
+        :raises InvalidGoalError: if validate is True and it isn't a goal
+        :raises: Exception if the AI call fails
+        """
+        if validate and self.goal_classifier is not None:
+            decision = self.goal_classifier.classify(goal)
+            if decision is False:
+                raise InvalidGoalError(goal)
+            validate = decision is None  # Known goals need no AI check
+
+        key = None
+        if self.cache is not None:
+            key = make_key(goal, time_available, adjust, focus)
+            if use_cache:
+                cached = self.cache.get(key)
+                if cached:
+                    yield from cached
+                    return
+
+        prompt = self._build_prompt(goal, time_available, adjust, focus, validate)
+        tasks = []
+        try:
+            for line in self._stream_lines(prompt):
+                if validate and not tasks and self._is_invalid_reply(line):
+                    self._remember_goal(goal, False)
+                    raise InvalidGoalError(goal)
+                try:
+                    task = self._parse_line(line)
+                except ValueError:
+                    continue  # Already shown tasks can't be taken back
+                if task is not None:
+                    tasks.append(task)
+                    yield task
+        except InvalidGoalError:
+            raise
+        except Exception:
+            if tasks:
+                raise  # Can't start over once tasks are shown
+
+        if not tasks:
+            tasks = self._request_tasks(
+                prompt, time_available, retries, allow_invalid=validate
+            )
+            if tasks is False:
+                self._remember_goal(goal, False)
+                raise InvalidGoalError(goal)
+            for task in tasks or []:
+                yield task
+        else:
+            self._fit_tasks_to_time(tasks, time_available)
+
+        if validate:
+            self._remember_goal(goal, True)
+        if tasks and key is not None:
+            self.cache.put(key, tasks)
+
+    def _remember_goal(self, goal, valid):
+        """
+        Tell the goal classifier (if any) what the AI decided.
+
+        :param goal: the user's input
+        :param valid: True if it is a goal
+        """
+        if self.goal_classifier is not None:
+            self.goal_classifier.remember(goal, valid)
+
+    def _stream_lines(self, prompt):
+        """
+        Send a prompt and hand out the answer line by line as it arrives.
+
+        :param prompt: the prompt string to send
+        :return: generator of complete lines (without the newline)
+        :raises: Exception if the AI call fails
+        """
+        try:
+            response = self.model.generate_content(prompt, stream=True)
+            buffer = ""
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except (AttributeError, ValueError):
+                    continue  # Chunk without text (e.g. safety metadata)
+                if not isinstance(text, str):
+                    continue
+                buffer += text
+                while "\n" in buffer:
+                    line, buffer = buffer.split("\n", 1)
+                    yield line
+        except Exception as e:
+            raise Exception(f"AI API call failed: {str(e)}") from e
+        if buffer:
+            yield buffer
+
+    def _request_tasks(self, prompt, time_available, retries, allow_invalid=False):
+        """
+        Ask the AI for steps, retrying on errors and unusable answers.
+
+        :param prompt: the prompt string to send
+        :param time_available: minutes the steps must fit into
+        :param retries: number of attempts
+        :param allow_invalid: accept INVALID_GOAL_REPLY as an answer
+        :return: list of Task objects, None if all retries fail,
+            or False if the AI said the input isn't a goal
+        :raises: Exception if all retries fail with API errors
+        """
         last_error = None
         for attempt in range(retries):
             try:
-                prompt = self._build_prompt(goal, time_available, adjust, focus)
                 response_text = self._call_ai(prompt)
 
                 if response_text is None:
                     continue
 
-                tasks = self._parse_response(response_text)
+                tasks = self._parse_response(response_text, allow_invalid)
+
+                if tasks is None:
+                    return False  # Not a goal - asking again won't help
 
                 if len(tasks) == 0:
                     continue
@@ -98,7 +588,9 @@ class AIHelper:
             )
         return None
 
-    def _build_prompt(self, goal, time_available, adjust=None, focus=None):
+    def _build_prompt(
+        self, goal, time_available, adjust=None, focus=None, validate=False
+    ):
         """
         Build the prompt based on goal and adjustment.
 
@@ -106,6 +598,7 @@ class AIHelper:
         :param time_available: how many minutes user has right now
         :param adjust: adjustment type ("too_hard", "not_enough", "different_focus", or None)
         :param focus: specific focus area when adjust="different_focus"
+        :param validate: also ask the AI to reject input that isn't a goal
         :return: prompt string
         """
         prompt = f"""
@@ -154,6 +647,14 @@ class AIHelper:
             Make sure all steps are related to this focus area.
             """
 
+        if validate:
+            prompt += f"""
+            Before breaking it down, check that the task is a clear, actionable goal
+            (like "write an essay", "clean my room", "study for exam").
+            If it's gibberish, random characters, single letters, or doesn't make sense
+            as a task, reply with only "{INVALID_GOAL_REPLY}" and no steps.
+            """
+
         return prompt
 
     def _call_ai(self, prompt):
@@ -165,29 +666,7 @@ class AIHelper:
         """
         try:
             response = self.model.generate_content(prompt)
-
-            # Handle different response formats
-            if hasattr(response, "text") and response.text:
-                return response.text
-            elif hasattr(response, "candidates") and response.candidates:
-                # Try to get text from candidates
-                candidate = response.candidates[0]
-                if hasattr(candidate, "content") and hasattr(
-                    candidate.content, "parts"
-                ):
-                    parts = candidate.content.parts
-                    if parts and hasattr(parts[0], "text"):
-                        return parts[0].text
-            elif hasattr(response, "parts") and response.parts:
-                # Alternative response structure
-                if hasattr(response.parts[0], "text"):
-                    return response.parts[0].text
-
-            # If we get here, response structure is unexpected
-            print(
-                f"Warning: AI response has unexpected structure. Response type: {type(response)}"
-            )
-            return None
+            return self._response_text(response)
         except Exception as e:
             # Log the actual error for debugging
             error_msg = f"Error calling AI: {type(e).__name__}: {str(e)}"
@@ -195,7 +674,35 @@ class AIHelper:
             # Re-raise with more context for better error messages
             raise Exception(f"AI API call failed: {str(e)}") from e
 
-    def _parse_response(self, response_text):
+    def _response_text(self, response):
+        """
+        Get the text out of a model response.
+
+        :param response: response from generate_content()
+        :return: response text, or None if the structure is unexpected
+        """
+        # Handle different response formats
+        if hasattr(response, "text") and response.text:
+            return response.text
+        elif hasattr(response, "candidates") and response.candidates:
+            # Try to get text from candidates
+            candidate = response.candidates[0]
+            if hasattr(candidate, "content") and hasattr(candidate.content, "parts"):
+                parts = candidate.content.parts
+                if parts and hasattr(parts[0], "text"):
+                    return parts[0].text
+        elif hasattr(response, "parts") and response.parts:
+            # Alternative response structure
+            if hasattr(response.parts[0], "text"):
+                return response.parts[0].text
+
+        # If we get here, response structure is unexpected
+        print(
+            f"Warning: AI response has unexpected structure. Response type: {type(response)}"
+        )
+        return None
+
+    def _parse_response(self, response_text, allow_invalid=False):
         """
         Parse AI response into a list of Task objects.
 
@@ -204,46 +711,69 @@ class AIHelper:
             2 | Read chapter 1 | 15
             3 | Take notes | 10
 
+        or, for the combined prompt (allow_invalid=True), just:
+            INVALID
+
         :param response_text: raw text from AI
-        :return: list of Task objects, or empty list if parsing fails
+        :param allow_invalid: recognize INVALID_GOAL_REPLY
+        :return: list of Task objects, or empty list if parsing fails,
+            or None if the AI rejected the goal
         """
         tasks = []
         lines = response_text.strip().split("\n")
 
+        if allow_invalid and self._is_invalid_reply(lines[0]):
+            return None
+
         for line in lines:
-            # Skip lines that don't have the pipe separator
-            if "|" in line:
-                parts = line.split("|")
+            try:
+                task = self._parse_line(line)
+            except ValueError:
+                return []  # Invalid format - retry with new AI call
+            if task is not None:
+                tasks.append(task)
 
-                # Must have exactly 3 parts: number | description | minutes
-                if len(parts) != 3:
-                    return []  # Invalid format - retry with new AI call
+        return tasks
 
-                # Parse task number
-                try:
-                    task_number = int(parts[0].strip())
-                except ValueError:
-                    return []
+    def _is_invalid_reply(self, line):
+        """
+        Check if a response line is the combined prompt's rejection.
 
-                description = parts[1].strip()
+        :param line: one line of AI response
+        :return: True if it says INVALID_GOAL_REPLY
+        """
+        return line.strip().strip('."*').upper() == INVALID_GOAL_REPLY
 
-                # Parse minutes (must be positive)
-                try:
-                    minutes = int(parts[2].strip())
-                    if minutes <= 0:
-                        return []  # Invalid time - retry with new AI call
-                except ValueError:
-                    return []
+    def _parse_line(self, line):
+        """
+        Parse one "number | description | minutes" line.
 
-                tasks.append(
-                    Task(
-                        task_number=task_number,
-                        description=description,
-                        timer_minutes=minutes,
-                    )
-                )
+        :param line: one line of AI response
+        :return: Task object, or None if the line isn't a step (no pipe)
+        :raises ValueError: if the line is a step in the wrong format
+        """
+        # Skip lines that don't have the pipe separator
+        if "|" not in line:
+            return None
+        parts = line.split("|")
 
-        return tasks
+        # Must have exactly 3 parts: number | description | minutes
+        if len(parts) != 3:
+            raise ValueError(f"Expected 3 parts, got {len(parts)}: {line!r}")
+
+        task_number = int(parts[0].strip())
+        description = parts[1].strip()
+
+        # Minutes must be positive
+        minutes = int(parts[2].strip())
+        if minutes <= 0:
+            raise ValueError(f"Minutes must be positive: {line!r}")
+
+        return Task(
+            task_number=task_number,
+            description=description,
+            timer_minutes=minutes,
+        )
 
     def _fit_tasks_to_time(self, tasks, time_available):
         """
@@ -0,0 +1,179 @@
+"""
+archive.py
+Cold storage for old completed sessions.
+
+Sessions are appended to gzip-compressed JSON-lines segment files:
+
+    data/archive/
+        index.json                 {session_id: {status, goal, created_at, created_ts,
+                                                 task_count, segment}}
+        segment-00001.jsonl.gz     {"id": "...", "session": {...}} per line
+        segment-00002.jsonl.gz
+
+Segments are only ever appended to. The entries dictionary is replaced
+rather than changed in place, so storage snapshots can share it. Deleting an archived session just
+removes it from index.json, so it can no longer be found.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+
+# Start a new segment once the current one reaches 8 MB (compressed)
+SEGMENT_MAX_BYTES = 8 * 1024 * 1024
+
+
+class Archive:
+    def __init__(self, directory="data/archive"):
+        """
+        Open (or create) an archive folder.
+
+        :param directory: folder holding index.json and the segment files
+        """
+        self.directory = directory
+        self.index_filename = os.path.join(directory, "index.json")
+
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # session_id -> listing fields plus the segment it lives in
+        self.entries = self._load_index()
+
+    def _load_index(self):
+        """
+        Read index.json.
+
+        :return: dictionary of archived sessions, or empty dict
+        """
+        try:
+            with open(self.index_filename, "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self):
+        """Write index.json atomically and make sure it reached the disk."""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            json.dump(self.entries, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.index_filename)
+
+    def _current_segment(self):
+        """
+        Pick the segment new sessions are appended to.
+
+        :return: segment file name (not the full path)
+        """
+        segments = sorted(
+            name for name in os.listdir(self.directory) if name.startswith("segment-")
+        )
+        if segments:
+            last = segments[-1]
+            if os.path.getsize(os.path.join(self.directory, last)) < SEGMENT_MAX_BYTES:
+                return last
+            number = int(last.split("-")[1].split(".")[0]) + 1
+        else:
+            number = 1
+        return f"segment-{number:05d}.jsonl.gz"
+
+    def add(self, sessions):
+        """
+        Append sessions to the archive.
+        Data is synced to disk before this returns, so the caller can
+        safely delete its own copy afterwards.
+
+        :param sessions: list of (session_id, session_dict) pairs
+        """
+        if not sessions:
+            return
+
+        segment = self._current_segment()
+        path = os.path.join(self.directory, segment)
+
+        # Each call adds one gzip member; readers see them as one stream
+        with open(path, "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="ab") as file:
+                for session_id, session_dict in sessions:
+                    line = json.dumps({"id": session_id, "session": session_dict})
+                    file.write((line + "\n").encode("utf-8"))
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        entries = dict(self.entries)
+        for session_id, session_dict in sessions:
+            entries[session_id] = {
+                "status": session_dict.get("status"),
+                "goal": session_dict.get("goal"),
+                "created_at": session_dict.get("created_at"),
+                "created_ts": session_dict.get("created_ts"),
+                "task_count": len(session_dict.get("tasks", [])),
+                "segment": segment,
+            }
+        self.entries = entries
+        self._save_index()
+
+    def read(self, session_id):
+        """
+        Load one archived session.
+
+        :param session_id: session ID string
+        :return: dictionary from Session.to_dict(), or None if not archived
+        """
+        entry = self.entries.get(session_id)
+        if entry is None:
+            return None
+
+        path = os.path.join(self.directory, entry["segment"])
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    record = json.loads(line)
+                    if record.get("id") == session_id:
+                        return record.get("session")
+        except (FileNotFoundError, EOFError, OSError, json.JSONDecodeError):
+            pass
+        return None
+
+    def iter_sessions(self):
+        """
+        Read every archived session, one segment at a time.
+
+        :return: generator of (session_id, session_dict) pairs
+        """
+        segments = sorted({entry["segment"] for entry in self.entries.values()})
+        for segment in segments:
+            path = os.path.join(self.directory, segment)
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as file:
+                    for line in file:
+                        record = json.loads(line)
+                        session_id = record.get("id")
+                        if session_id in self.entries:
+                            yield session_id, record.get("session")
+            except (FileNotFoundError, EOFError, OSError, json.JSONDecodeError):
+                continue
+
+    def remove(self, session_ids):
+        """
+        Forget archived sessions.
+
+        :param session_ids: list of session ID strings
+        :return: list of IDs that were archived and are now removed
+        """
+        entries = dict(self.entries)
+        removed = [
+            session_id
+            for session_id in session_ids
+            if entries.pop(session_id, None) is not None
+        ]
+        if removed:
+            self.entries = entries
+            self._save_index()
+        return removed
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,150 @@
+"""
+codec.py
+Turns the sessions dictionary into file bytes and back.
+
+Two formats:
+
+    json    The original format - plain JSON, readable by anything.
+            Also notes where each session's bytes are, so storage can
+            read one session without parsing the rest.
+
+    binary  A header (MAGIC + format version byte), then the dictionary
+            in pickle's binary format. Strings and numbers are stored
+            without quoting or escaping and each dictionary key only once,
+            so the file is a lot smaller and loads faster. Only plain
+            data (dicts, lists, strings, numbers) can be decoded from it.
+
+Files are recognized by their first bytes (see detect_codec()), so a
+file in either format can be opened whichever codec is configured.
+"""
+
+import io
+import json
+import pickle
+
+# Start of a binary file. JSON text never starts with a NUL byte.
+MAGIC = b"\x00ATC"
+
+# Bumped when the binary layout changes, so old files can still be read
+FORMAT_VERSION = 1
+
+# Pickle protocol of FORMAT_VERSION 1 (fixed, so a newer Python writes
+# files an older one can still read)
+PICKLE_PROTOCOL = 4
+
+
+class JsonCodec:
+    name = "json"
+
+    def dump(self, data, file):
+        """
+        Write the sessions dictionary as JSON, noting where each session starts.
+        The bytes are the same as json.dump(data, file) would write.
+
+        :param data: dictionary of all sessions
+        :param file: file opened in binary mode
+        :return: dictionary of session_id -> [offset, length]
+        """
+        offsets = {}
+        file.write(b"{")
+        position = 1
+
+        for number, (session_id, session_dict) in enumerate(data.items()):
+            separator = ", " if number > 0 else ""
+            key = (separator + json.dumps(session_id) + ": ").encode("utf-8")
+            value = json.dumps(session_dict).encode("utf-8")
+
+            file.write(key)
+            position += len(key)
+            offsets[session_id] = [position, len(value)]
+            file.write(value)
+            position += len(value)
+
+        file.write(b"}")
+        return offsets
+
+    def load(self, raw):
+        """
+        Decode a whole JSON file.
+
+        :param raw: file contents as bytes
+        :return: dictionary of all sessions
+        :raises json.JSONDecodeError: if the file isn't valid JSON
+        """
+        return json.loads(raw)
+
+
+class _DataUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        """Refuse anything but plain data, so a data file can't run code."""
+        raise pickle.UnpicklingError(f"Not plain session data: {module}.{name}")
+
+
+class BinaryCodec:
+    name = "binary"
+
+    def dump(self, data, file):
+        """
+        Write the header and the sessions dictionary.
+
+        :param data: dictionary of all sessions
+        :param file: file opened in binary mode
+        :return: None - sessions can't be read one at a time from this format
+        """
+        file.write(MAGIC + bytes([FORMAT_VERSION]))
+        pickle.dump(data, file, protocol=PICKLE_PROTOCOL)
+        return None
+
+    def load(self, raw):
+        """
+        Decode a whole binary file.
+
+        :param raw: file contents as bytes, header included
+        :return: dictionary of all sessions
+        :raises ValueError: if the header or the data isn't valid
+        """
+        if not raw.startswith(MAGIC):
+            raise ValueError("Not a binary sessions file")
+        version = raw[len(MAGIC)] if len(raw) > len(MAGIC) else None
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary sessions format: {version!r}")
+
+        try:
+            data = _DataUnpickler(io.BytesIO(raw[len(MAGIC) + 1 :])).load()
+        except (pickle.UnpicklingError, EOFError) as error:
+            raise ValueError(f"Corrupt binary sessions file: {error}")
+        if not isinstance(data, dict):
+            raise ValueError("Corrupt binary sessions file: not a dictionary")
+        return data
+
+
+CODECS = {codec.name: codec for codec in (JsonCodec(), BinaryCodec())}
+
+
+def get_codec(name):
+    """
+    Get a codec by name.
+
+    :param name: "json" or "binary"
+    :return: codec object
+    :raises ValueError: if the name is unknown
+    """
+    if name not in CODECS:
+        raise ValueError(f"codec must be one of {list(CODECS)}, not {name!r}")
+    return CODECS[name]
+
+
+def detect_codec(head):
+    """
+    Tell which codec wrote a file from its first bytes.
+
+    :param head: at least the first len(MAGIC) bytes of the file
+    :return: codec object
+    """
+    if head.startswith(MAGIC):
+        return CODECS["binary"]
+    return CODECS["json"]
+
+
+if __name__ == "__main__":
+    pass
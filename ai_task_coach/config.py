@@ -11,3 +11,31 @@ from dotenv import load_dotenv
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+
+# Reuse task breakdowns for the same goal for this many seconds, in memory
+# and in a folder shared by all app processes (set AI_CACHE_DIR empty to
+# keep the cache in memory only)
+AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", 24 * 60 * 60))
+AI_CACHE_DIR = os.getenv("AI_CACHE_DIR", "data/ai_cache")
+
+# Give up on an AI answer after this many seconds instead of waiting forever
+AI_DEADLINE = float(os.getenv("AI_DEADLINE", 30))
+
+# Where sessions are kept: "json", "journal", "sharded", "sqlite",
+# or "memory" (nothing saved - for tests and benchmarks)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")
+
+# How hard session saves try to reach the disk: "none", "batch", or "always"
+STORAGE_DURABILITY = os.getenv("STORAGE_DURABILITY", "none")
+
+# Data file format: "json" (readable) or "binary" (smaller, faster to load).
+# An existing file is converted when the app starts.
+STORAGE_CODEC = os.getenv("STORAGE_CODEC", "json")
+
+# Move completed sessions older than this many days into compressed archive
+# files (leave unset to keep everything in the main data file)
+STORAGE_ARCHIVE_AFTER_DAYS = (
+    int(os.getenv("STORAGE_ARCHIVE_AFTER_DAYS"))
+    if os.getenv("STORAGE_ARCHIVE_AFTER_DAYS")
+    else None
+)
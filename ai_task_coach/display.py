@@ -42,27 +42,52 @@ class Display:
             self._print(f"   📊 Total: {total_completed} session(s) completed!")
         self._print()
 
-    def show_tasks(self, tasks):
+    def show_tasks(self, tasks, total_minutes=None):
         """
         Show list of tasks to user.
 
         :param tasks: list of Task objects
+        :param total_minutes: planned minutes if already known (Session.total_minutes)
         """
-        total_minutes = sum(task.timer_minutes for task in tasks)
+        if total_minutes is None:
+            total_minutes = sum(task.timer_minutes for task in tasks)
 
         self._print()
         self._print(f"Here's your plan (Total: {total_minutes} minutes):")
         self._print("-" * 40)
 
         for task in tasks:
-            status_icon = self._get_status_icon(task.status)
-            self._print(
-                f"  {status_icon} Task {task.task_number}: {task.description} ({task.timer_minutes} min)"
-            )
+            self._print(self._format_task(task))
 
         self._print("-" * 40)
         self._print()
 
+    def show_task_stream(self, tasks):
+        """
+        Show tasks one by one as they arrive (e.g. from
+        AIHelper.stream_break_down_goal()), before the whole plan is known.
+
+        :param tasks: iterable of Task objects
+        :return: list of the tasks shown
+        """
+        shown = []
+        for task in tasks:
+            if not shown:
+                self._print("Your plan so far:")
+            self._print(self._format_task(task))
+            shown.append(task)
+        return shown
+
+    def _format_task(self, task):
+        """
+        Format one task line.
+
+        :param task: Task object
+        :return: line like "  ⬜ Task 1: Open document (5 min)"
+        """
+        status_icon = self._get_status_icon(task.status)
+        return f"  {status_icon} Task {task.task_number}: {task.description} ({task.timer_minutes} min)"
+
     def _get_status_icon(self, status):
         """
         Get icon for task status.
@@ -100,17 +125,10 @@ class Display:
         self._print(f"  Goal: {session.goal}")
         self._print()
 
-        # Count tasks by status
-        completed = 0
-        skipped = 0
-
-        for task in session.tasks:
-            if task.status == "completed":
-                completed += 1
-            elif task.status == "skipped":
-                skipped += 1
-
-        total = len(session.tasks)
+        # Counted by the session as tasks change
+        completed = session.completed_count
+        skipped = session.skipped_count
+        total = session.task_count
 
         self._print(f"  ✅ Completed: {completed}/{total}")
         self._print(f"  ⏭️  Skipped: {skipped}/{total}")
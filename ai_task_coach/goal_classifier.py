@@ -0,0 +1,189 @@
+"""
+goal_classifier.py
+Decides the obvious cases of "is this a real goal?" locally, so only
+unclear input needs an AI call.
+
+    "Write my essay"        -> True   (starts with an action verb, known words)
+    "x", "???", "asdfgh"    -> False  (too short, no letters, keyboard mashing)
+    "quantum stuff maybe"   -> None   (unclear - ask the AI)
+
+Decisions (local ones and the AI's, via remember()) are kept in a small
+LRU, so asking about the same input again costs nothing.
+"""
+
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+
+DEFAULT_MAX_DECISIONS = 1024
+
+# Verbs a goal usually starts with
+ACTION_VERBS = frozenset("""
+    add answer apply arrange ask bake book brainstorm build buy call check
+    clean clear code collect complete cook create debug decorate delete design
+    do draft draw edit email exercise file finish fix fold go grade hang learn
+    list make meditate memorize move open order organize outline paint pay
+    plan plant plot practice prepare print program publish read record
+    refactor register renew repair reply research review revise rewrite run
+    schedule send set sew shop sign sketch solve sort start study submit
+    summarize take teach test tidy train translate update upload vacuum walk
+    wash watch water work write
+    """.split())
+
+# Other everyday words goals are made of
+COMMON_WORDS = frozenset("""
+    a about all an and application apartment article assignment at bathroom
+    bed bedroom bills blog book books budget bug car chapter chapters class
+    closet code course dinner discrete dishes doctor document draft email
+    emails english essay exam exams final finance floor for form french
+    friends from garage garden grocery groceries guitar history homework
+    house in inbox interview into invoice java kitchen language laundry
+    lecture letter lunch math meal meals my notes of on our page pages paper
+    papers part piano plan presentation project proposal python quiz recipe
+    report research resume room chemistry biology physics science slides
+    some song spanish speech statistics taxes test tests the thesis this
+    chore chores to tomorrow trip week website with work workout
+    """.split())
+
+# Words people put before the verb ("I need to write ...")
+FILLER_WORDS = frozenset(
+    "i im i'm need needs to want have has must should please let me".split()
+)
+
+KEYBOARD_ROWS = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
+VOWELS = frozenset("aeiouy")
+
+
+def _normalize(goal):
+    """
+    Normalize input for lookups.
+
+    :param goal: the user's input
+    :return: lowercased string with runs of whitespace collapsed
+    """
+    return " ".join(str(goal).lower().split())
+
+
+def _entropy(word):
+    """
+    Shannon entropy of a word's letters, in bits per letter.
+    Repeats like "aaaa" or "abab" score near zero.
+
+    :param word: string
+    :return: entropy in bits
+    """
+    counts = Counter(word)
+    return -sum(
+        count / len(word) * math.log2(count / len(word)) for count in counts.values()
+    )
+
+
+def _looks_random(word):
+    """
+    Check if an (English-alphabet) word looks like random typing.
+
+    :param word: lowercase word
+    :return: True for keyboard mashing, vowel-less runs, or repeats
+    """
+    if not word.isascii() or len(word) < 4:
+        return False
+    if not VOWELS.intersection(word):
+        return True
+    if re.search(r"[^aeiouy]{5,}", word):
+        return True
+    if any(
+        word[start : start + 4] in row
+        for row in KEYBOARD_ROWS
+        for start in range(len(word) - 3)
+    ):
+        return True
+    return _entropy(word) < 1.1
+
+
+def _is_known(word):
+    """
+    Check if a word is in the built-in lexicon.
+
+    :param word: lowercase word
+    :return: True if it is an action verb or a common goal word
+    """
+    return word in ACTION_VERBS or word in COMMON_WORDS
+
+
+class GoalClassifier:
+    def __init__(self, max_decisions=DEFAULT_MAX_DECISIONS):
+        """
+        Create a classifier with an empty decision cache.
+
+        :param max_decisions: inputs remembered before the least recently
+            used one is dropped
+        """
+        self.max_decisions = max_decisions
+        self._decisions = OrderedDict()  # Least recently used first
+        self._lock = threading.Lock()
+
+    def classify(self, goal):
+        """
+        Decide locally whether the input is a real goal, if it's clear.
+
+        :param goal: the user's input
+        :return: True (goal), False (not a goal), or None (ask the AI)
+        """
+        key = _normalize(goal)
+        with self._lock:
+            if key in self._decisions:
+                self._decisions.move_to_end(key)
+                return self._decisions[key]
+
+        decision = self._judge(key)
+        if decision is not None:
+            self.remember(goal, decision)
+        return decision
+
+    def remember(self, goal, valid):
+        """
+        Store a decision (e.g. the AI's answer for an unclear input).
+
+        :param goal: the user's input
+        :param valid: True if it is a goal
+        """
+        key = _normalize(goal)
+        with self._lock:
+            self._decisions[key] = valid
+            self._decisions.move_to_end(key)
+            while len(self._decisions) > self.max_decisions:
+                self._decisions.popitem(last=False)
+
+    def _judge(self, text):
+        """
+        Apply the length, word, and randomness rules.
+
+        :param text: normalized input
+        :return: True, False, or None if unclear
+        """
+        if sum(char.isalpha() for char in text) < 2:
+            return False  # Empty, single letters, numbers, punctuation
+
+        words = re.findall(r"[^\W\d_]+(?:'[^\W\d_]+)?", text)
+        random_words = [word for word in words if _looks_random(word)]
+        if len(random_words) == len(words) and not any(map(_is_known, words)):
+            return False
+
+        content = list(words)
+        while content and content[0] in FILLER_WORDS:
+            content.pop(0)  # "I need to write ..." -> "write ..."
+        known = [word for word in content if _is_known(word)]
+        if (
+            len(content) >= 2
+            and content[0] in ACTION_VERBS
+            and len(known) * 2 >= len(content)
+            and not random_words
+        ):
+            return True
+
+        return None
+
+
+if __name__ == "__main__":
+    pass
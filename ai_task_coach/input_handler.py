@@ -19,10 +19,12 @@ class InputHandler:
         self._input = input_func or input
         self._print = print_func or print
 
-    def get_goal(self):
+    def get_goal(self, validate=True):
         """
         Get and validate goal from user.
 
+        :param validate: check the goal with the AI here (False when the
+            caller validates it together with the breakdown)
         :return: valid goal string, or None if user quits
         """
         self._print()
@@ -39,7 +41,7 @@ class InputHandler:
                 goal = self._input("Your goal: ").strip()
                 continue
 
-            if self.ai and not self.ai.validate_goal(goal):
+            if validate and self.ai and not self.ai.validate_goal(goal):
                 self._print(
                     "I didn't understand that. Please describe your goal more clearly."
                 )
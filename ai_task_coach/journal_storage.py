@@ -0,0 +1,272 @@
+"""
+journal_storage.py
+Append-only storage engine for sessions.
+
+Instead of rewriting the whole JSON file on every save, each change is
+appended to a log file as one JSON line:
+
+    {"op": "put", "id": "8ccacbf0-...", "session": {...}}
+    {"op": "patch", "id": "8ccacbf0-...", "patch": {"fields": {...}, "tasks": {...}}}
+    {"op": "del", "id": "8b5659e0-..."}
+
+A "patch" carries only the fields that changed (e.g. current_task and one
+task's status), so moving through a session appends a few bytes per step.
+
+On startup the snapshot file (same formats as storage.py) is loaded and the
+log is replayed on top of it. When the log grows past a size threshold it is
+compacted: the current state is written as a new snapshot and the log is
+emptied.
+
+Appends and compaction hold the same lock file as storage.py, so several
+processes can share one log. When replaying, a "put" whose version is not
+newer than the stored one is skipped, so the first save of a version wins.
+"""
+
+import json
+import os
+import threading
+from session import apply_patch
+from storage import Storage
+
+# Compact once the log reaches 1 MB
+DEFAULT_COMPACT_THRESHOLD = 1024 * 1024
+
+
+class JournalStorage(Storage):
+    def __init__(
+        self,
+        filename="data/sessions.json",
+        log_filename=None,
+        compact_threshold=DEFAULT_COMPACT_THRESHOLD,
+        **kwargs,
+    ):
+        """
+        Create journaled storage handler.
+
+        :param filename: path to the snapshot JSON file
+        :param log_filename: path to the append-only log (default: filename + ".log")
+        :param compact_threshold: log size in bytes that triggers compaction
+        :param kwargs: other Storage options (durability, archive_after_days, ...)
+        """
+        self.log_filename = log_filename or filename + ".log"
+        self.compact_threshold = compact_threshold
+        self._compacting = False
+        self._pending = []  # Records not yet written to the log
+        super().__init__(filename, **kwargs)
+
+    def _file_stamp(self):
+        """
+        Fingerprint both the snapshot and the log.
+
+        :return: tuple combining both files' (mtime_ns, size, inode)
+        """
+        stamps = []
+        for path in (self.filename, self.log_filename):
+            try:
+                stat = os.stat(path)
+                stamps.extend([stat.st_mtime_ns, stat.st_size, stat.st_ino])
+            except FileNotFoundError:
+                stamps.extend([0, 0, 0])
+        return tuple(stamps)
+
+    def _read_file(self):
+        """
+        Load the snapshot, then replay the log on top of it.
+
+        :return: dictionary of all sessions
+        """
+        data = super()._read_file()
+
+        try:
+            with open(self.log_filename, "r") as log:
+                for line in log:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write from a crash - only the last record is lost
+                        continue
+                    self._apply_record(data, record)
+        except FileNotFoundError:
+            pass
+
+        return data
+
+    def _apply_record(self, data, record):
+        """
+        Apply one log record to the sessions dictionary.
+
+        :param data: dictionary of all sessions
+        :param record: one decoded log line
+        """
+        op = record.get("op")
+        session_id = record.get("id")
+
+        if op == "put":
+            session_dict = record.get("session", {})
+            stored = data.get(session_id)
+            if (
+                stored is not None
+                and "version" in session_dict
+                and stored.get("version", 0) >= session_dict["version"]
+            ):
+                return  # Another process saved this version first
+            data[session_id] = session_dict
+        elif op == "patch":
+            patch = record.get("patch", {})
+            stored = data.get(session_id)
+            if stored is None:
+                return  # Deleted meanwhile
+            if stored.get("version", 0) >= patch["fields"].get("version", 0):
+                return  # Another process saved this version first
+            data[session_id] = apply_patch(stored, patch)
+        elif op == "del":
+            data.pop(session_id, None)
+
+    def _write_sessions(self, items):
+        """
+        Append "put" records instead of rewriting the snapshot.
+
+        :param items: list of (session ID string, dictionary from Session.to_dict())
+        """
+        with self._locked():
+            data = dict(self._load_file())  # Copy - the old version may be in use
+            for session_id, session_dict in items:
+                data[session_id] = session_dict
+            self._publish(data)
+            self._append(
+                [
+                    {"op": "put", "id": session_id, "session": session_dict}
+                    for session_id, session_dict in items
+                ]
+            )
+
+    def _patch_session(self, session_id, stored, patch):
+        """
+        Append a "patch" record with only the changed fields.
+
+        :param session_id: session ID string
+        :param stored: the session's currently stored dictionary
+        :param patch: dictionary from Session.to_patch(), including the new version
+        """
+        with self._locked():
+            data = dict(self._load_file())  # Copy - the old version may be in use
+            data[session_id] = apply_patch(stored, patch)
+            self._publish(data)
+            self._append([{"op": "patch", "id": session_id, "patch": patch}])
+
+    def _remove_sessions(self, session_ids):
+        """
+        Append one "del" (tombstone) record per session in a single write.
+
+        :param session_ids: list of session ID strings
+        """
+        with self._locked():
+            data = dict(self._load_file())  # Copy - the old version may be in use
+            records = []
+            for session_id in session_ids:
+                if session_id in data:
+                    del data[session_id]
+                    records.append({"op": "del", "id": session_id})
+            if records:
+                self._publish(data)
+                self._append(records)
+
+    def _persist_index(self):
+        """
+        Skip saving the status index file.
+        Rewriting it on every append would undo the point of the log, and
+        replaying the log on open already visits every session.
+        """
+
+    def _append(self, records):
+        """
+        Queue records for the log.
+        Written right away unless inside a transaction or in "batch" mode.
+
+        :param records: list of record dictionaries
+        """
+        with self._locked():
+            self._pending.extend(records)
+            self._dirty = True
+
+            if self._transaction_depth > 0:
+                return
+            if self.durability == "batch":
+                self._schedule_flush()
+                return
+            self._write_pending()
+
+    def flush(self):
+        """Write any queued records to the log now."""
+        with self._locked():
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._pending:
+                self._write_pending()
+
+    def _write_pending(self):
+        """Append queued records to the log, then compact in the background if needed."""
+        # Did another process append since we last read the log?
+        external = self._file_stamp() != self._cache_stamp
+
+        lines = "".join(json.dumps(record) + "\n" for record in self._pending)
+        with open(self.log_filename, "a") as log:
+            log.write(lines)
+            if self.durability != "none":
+                log.flush()
+                os.fsync(log.fileno())
+
+        self._pending = []
+        self._dirty = False
+        if external:
+            self._cache_stamp = None  # Replay their records on the next read
+        else:
+            self._mark_written()
+
+        try:
+            log_size = os.path.getsize(self.log_filename)
+        except FileNotFoundError:
+            log_size = 0
+
+        if log_size >= self.compact_threshold and not self._compacting:
+            self._compacting = True
+            threading.Thread(target=self._compact_in_background, daemon=True).start()
+
+    def _compact_in_background(self):
+        """Run compaction on a worker thread."""
+        try:
+            self.compact()
+        finally:
+            self._compacting = False
+
+    def compact(self):
+        """Write the current state as a new snapshot and empty the log."""
+        with self._locked():
+            self.flush()
+            self._save_file(self._load_file())
+
+    def _save_file(self, data):
+        """
+        Save a full snapshot and empty the log.
+
+        The snapshot is written to a temp file and renamed over the old one,
+        so a crash leaves either the old or the new snapshot. Replaying the
+        old log on top of the new snapshot is harmless.
+
+        :param data: dictionary to save
+        """
+        with self._locked():
+            self._write_atomically(
+                self.filename, lambda file: self.codec.dump(data, file), binary=True
+            )
+
+            with open(self.log_filename, "w"):
+                pass  # Truncate
+
+            self._publish(data)
+            self._mark_written()
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,70 @@
+"""
+memory_storage.py
+Keeps sessions in memory only - nothing is read from or written to disk.
+
+Same behavior as storage.Storage (versions and conflicts, transactions,
+snapshots, indexes), just without the file, so tests and benchmarks
+run at memory speed. Everything is gone when the object is.
+"""
+
+from contextlib import contextmanager
+from storage import Storage
+
+# Stands in for the data file's (mtime, size, inode): it never changes
+# behind our back, so the cached dictionary is always current
+MEMORY_STAMP = ("memory",)
+
+
+class MemoryStorage(Storage):
+    def __init__(self):
+        """Create an empty in-memory storage handler."""
+        super().__init__(filename="")
+
+    def _initialize(self):
+        """Start with no sessions."""
+        self._save_file({})
+
+    @contextmanager
+    def _locked(self):
+        """Only threads in this process can share the data, so no lock file."""
+        with self._write_lock:
+            yield
+
+    def _file_stamp(self):
+        """
+        Get the fingerprint of the (imaginary) data file.
+
+        :return: MEMORY_STAMP
+        """
+        return MEMORY_STAMP
+
+    def _read_file(self):
+        """
+        Nothing to read before the first save.
+
+        :return: empty dictionary
+        """
+        return {}
+
+    def _write_data(self, data):
+        """
+        "Write" the sessions dictionary - it is already the cached copy.
+
+        :param data: dictionary to save
+        """
+        self._dirty = False
+        self._changes = {}
+        self._mark_written()
+
+    def _read_index_file(self, stamp):
+        """
+        There is no saved index; it is always built from the data.
+
+        :param stamp: ignored
+        :return: None
+        """
+        return None
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,220 @@
+"""
+response_cache.py
+Remembers AI task breakdowns, so asking for the same goal again doesn't
+wait for (and pay for) another Gemini call.
+
+Two tiers:
+    memory  The most recently used answers in this process (LRU).
+    disk    One small JSON file per answer in a folder, shared by every
+            process using it and kept across restarts.
+
+Answers expire after ttl seconds in both tiers. Keys come from the
+normalized inputs (see make_key()), so "Write  Essay" and "write essay"
+share an answer.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from task import Task
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 24 * 60 * 60  # One day
+
+
+def _normalize(text):
+    """
+    Normalize free text for use in a key.
+
+    :param text: string, or None
+    :return: lowercased string with runs of whitespace collapsed ("" for None)
+    """
+    return " ".join(str(text or "").lower().split())
+
+
+def make_key(goal, time_available, adjust=None, focus=None):
+    """
+    Build the cache key for one breakdown request.
+
+    :param goal: the user's goal
+    :param time_available: minutes available
+    :param adjust: adjustment type, or None
+    :param focus: focus area for "different_focus", or None
+    :return: key string (hex digest)
+    """
+    inputs = [_normalize(goal), int(time_available), adjust or "", _normalize(focus)]
+    return hashlib.sha256(json.dumps(inputs).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self, directory=None, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL
+    ):
+        """
+        Create a response cache.
+
+        :param directory: folder for the disk tier (None for memory only)
+        :param max_entries: answers kept in memory before the least recently
+            used one is dropped
+        :param ttl: seconds an answer stays valid
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        # key -> (expires_at, task rows), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        """
+        Look up an answer.
+
+        :param key: key from make_key()
+        :return: list of new Task objects, or None if not cached (or expired)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, rows = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return self._to_tasks(rows)
+                del self._entries[key]
+
+        entry = self._read_disk(key, now)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, *entry)
+        return self._to_tasks(entry[1])
+
+    def put(self, key, tasks):
+        """
+        Store an answer in both tiers.
+
+        :param key: key from make_key()
+        :param tasks: list of Task objects (copied, so later changes don't leak in)
+        """
+        rows = [
+            (task.task_number, task.description, task.timer_minutes) for task in tasks
+        ]
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, rows)
+        self._write_disk(key, expires_at, rows)
+
+    def stats(self):
+        """
+        Get hit and miss counts.
+
+        :return: dictionary with memory_hits, disk_hits, misses, and size
+        """
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+    def _remember(self, key, expires_at, rows):
+        """
+        Put an answer in the memory tier. Caller holds the lock.
+
+        :param key: cache key
+        :param expires_at: epoch seconds when it expires
+        :param rows: list of (task_number, description, timer_minutes)
+        """
+        self._entries[key] = (expires_at, rows)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _to_tasks(self, rows):
+        """
+        Build fresh Task objects, so callers can change them freely.
+
+        :param rows: list of (task_number, description, timer_minutes)
+        :return: list of Task objects
+        """
+        return [
+            Task(number, description, minutes) for number, description, minutes in rows
+        ]
+
+    def _path(self, key):
+        """
+        Get the disk tier file for a key.
+
+        :param key: cache key
+        :return: file path
+        """
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_disk(self, key, now):
+        """
+        Read an answer from the disk tier, dropping it if expired.
+
+        :param key: cache key
+        :param now: current epoch seconds
+        :return: (expires_at, rows), or None if missing, expired, or unreadable
+        """
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r") as file:
+                saved = json.load(file)
+            expires_at = saved["expires_at"]
+            rows = [tuple(row) for row in saved["tasks"]]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            return None
+
+        if expires_at <= now:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass  # Another process removed it first
+            return None
+        return expires_at, rows
+
+    def _write_disk(self, key, expires_at, rows):
+        """
+        Write an answer to the disk tier via a temp file + rename,
+        so other processes never read half a file.
+
+        :param key: cache key
+        :param expires_at: epoch seconds when it expires
+        :param rows: list of (task_number, description, timer_minutes)
+        """
+        if not self.directory:
+            return
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as file:
+                json.dump({"expires_at": expires_at, "tasks": rows}, file)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            # The cache is only an optimization - never fail a breakdown over it
+            if temp_path and os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+
+if __name__ == "__main__":
+    pass
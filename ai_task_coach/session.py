@@ -5,10 +5,105 @@ Represents one task breakdown session.
 """
 
 from datetime import datetime
+import sys
 import uuid
 
+# How created_at is stored and shown, e.g. "2025-11-27 23:36:11"
+CREATED_AT_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Fields saved by to_dict(). Assigning one marks it as changed;
+# replacing the tasks list means the whole session has to be saved.
+SESSION_FIELDS = (
+    "goal",
+    "time_available",
+    "status",
+    "current_task",
+    "created_at",
+    "tasks",
+)
+
+
+def apply_patch(session_dict, patch):
+    """
+    Apply a patch from Session.to_patch() to a saved session dictionary.
+
+    :param session_dict: dictionary from Session.to_dict()
+    :param patch: dictionary from Session.to_patch()
+    :return: new dictionary (session_dict is not changed)
+    """
+    patched = dict(session_dict)
+    patched.update(patch["fields"])
+
+    if patch["tasks"]:
+        tasks = list(patched.get("tasks", []))
+        for position, changes in patch["tasks"].items():
+            position = int(position)  # JSON keys are strings
+            tasks[position] = dict(tasks[position], **changes)
+        patched["tasks"] = tasks
+
+    return patched
+
+
+def parse_created_at(created_at):
+    """
+    Convert a created_at string to a Unix timestamp.
+
+    :param created_at: time string in CREATED_AT_FORMAT (or ISO format)
+    :return: seconds since the epoch, as an int
+    :raises ValueError: if the string isn't a known time format
+    """
+    try:
+        moment = datetime.strptime(created_at, CREATED_AT_FORMAT)
+    except ValueError:
+        moment = datetime.fromisoformat(created_at)
+    return int(moment.timestamp())
+
+
+def session_created_ts(session_dict):
+    """
+    Get the created time of a saved session (or listing entry) in epoch seconds.
+    Older files only have the created_at string.
+
+    :param session_dict: dictionary from Session.to_dict() or a listing entry
+    :return: seconds since the epoch, or None if unknown
+    """
+    created_ts = session_dict.get("created_ts")
+    if created_ts is not None:
+        return created_ts
+    try:
+        return parse_created_at(session_dict.get("created_at"))
+    except (TypeError, ValueError):
+        return None
+
+
+def format_created_at(created_ts):
+    """
+    Convert a Unix timestamp to a created_at string.
+
+    :param created_ts: seconds since the epoch
+    :return: local time string in CREATED_AT_FORMAT
+    """
+    return datetime.fromtimestamp(created_ts).strftime(CREATED_AT_FORMAT)
+
 
 class Session:
+    # No per-object __dict__ - large histories hold many of these
+    __slots__ = (
+        "_changed",
+        "_saved_task_count",
+        "goal",
+        "time_available",
+        "session_id",
+        "status",
+        "tasks",
+        "current_task",
+        "created_ts",
+        "version",
+        "completed_count",
+        "skipped_count",
+        "total_minutes",
+    )
+
     def __init__(
         self,
         goal,
@@ -18,6 +113,8 @@ class Session:
         current_task=0,
         session_id=None,
         created_at=None,
+        version=0,
+        created_ts=None,
     ):
         """
         Create a new session.
@@ -27,18 +124,122 @@ class Session:
         :param status: "in_progress", "paused", or "completed"
         :param tasks: list of Task objects
         :param current_task: index of current task (0-based)
-        :param session_id: existing session ID (for restoring from JSON)
-        :param created_at: existing created time (for restoring from JSON)
+        :param session_id: existing session ID, str or UUID (for restoring from JSON)
+        :param created_at: existing created time string (for restoring from JSON)
+        :param version: how many times it has been saved (for conflict checks)
+        :param created_ts: existing created time in epoch seconds (wins over created_at)
         """
+        # Names of fields changed since the last save (None: never saved)
+        self._changed = None
+        self._saved_task_count = 0
+
         self.goal = goal
         self.time_available = time_available
-        self.session_id = session_id if session_id else uuid.uuid4()
+        # Always an interned string, so lookups never need str() or UUID compares
+        self.session_id = sys.intern(str(session_id if session_id else uuid.uuid4()))
         self.status = status
         self.tasks = tasks or []
         self.current_task = current_task
-        self.created_at = (
-            created_at if created_at else datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        )
+        # Kept as seconds since the epoch; created_at is the string view
+        if created_ts is not None:
+            self.created_ts = int(created_ts)
+        elif created_at:
+            self.created_ts = parse_created_at(created_at)
+        else:
+            self.created_ts = int(datetime.now().timestamp())
+        self.version = version
+
+    @property
+    def created_at(self):
+        """Created time as a string, e.g. "2025-11-27 23:36:11"."""
+        return format_created_at(self.created_ts)
+
+    @created_at.setter
+    def created_at(self, created_at):
+        """
+        Set the created time from a string.
+
+        :param created_at: time string in CREATED_AT_FORMAT
+        """
+        self.created_ts = parse_created_at(created_at)
+
+    def __setattr__(self, name, value):
+        """Record which saved fields change, so storage can write only those."""
+        tracked = "created_at" if name == "created_ts" else name
+        if tracked in SESSION_FIELDS and getattr(self, "_changed", None) is not None:
+            self._changed.add(tracked)
+        object.__setattr__(self, name, value)
+        if name == "tasks":
+            self._count_tasks()
+
+    def _count_tasks(self):
+        """
+        Recount progress after the tasks list was replaced.
+        From then on each task updates the counters itself when its
+        status or minutes change, so reading them is O(1).
+        Replace the list rather than changing it in place.
+        """
+        self.completed_count = 0
+        self.skipped_count = 0
+        self.total_minutes = 0
+        for task in self.tasks:
+            task._owner = self
+            self._task_changed("status", None, task.status)
+            self._task_changed("timer_minutes", 0, task.timer_minutes)
+
+    def _task_changed(self, name, old_value, new_value):
+        """
+        Update progress counters when a task field changes.
+
+        :param name: the task field being set
+        :param old_value: value before the change
+        :param new_value: value after the change
+        """
+        if name == "status":
+            for status, change in ((old_value, -1), (new_value, 1)):
+                if status == "completed":
+                    self.completed_count += change
+                elif status == "skipped":
+                    self.skipped_count += change
+        elif name == "timer_minutes":
+            self.total_minutes += (new_value or 0) - (old_value or 0)
+
+    @property
+    def task_count(self):
+        """Number of tasks in the session."""
+        return len(self.tasks)
+
+    def mark_saved(self):
+        """Forget changes - the session now matches what was saved."""
+        self._changed = set()
+        self._saved_task_count = len(self.tasks)
+        for task in self.tasks:
+            task.mark_saved()
+
+    def to_patch(self):
+        """
+        Convert only what changed since the last save to a dictionary.
+
+        :return: {"fields": {...}, "tasks": {position: {...}}}, or None if
+            the whole session has to be saved (never saved, or tasks replaced)
+        """
+        if self._changed is None or "tasks" in self._changed:
+            return None
+        if len(self.tasks) != self._saved_task_count:
+            return None
+
+        task_changes = {}
+        for position, task in enumerate(self.tasks):
+            changes = task.get_changes()
+            if changes is None:
+                return None  # A new task was put in the list
+            if changes:
+                task_changes[str(position)] = changes
+
+        fields = {name: getattr(self, name) for name in self._changed}
+        if "created_at" in fields:
+            fields["created_ts"] = self.created_ts
+        return {"fields": fields, "tasks": task_changes}
 
     def pause(self):
         """Pause the session."""
@@ -71,13 +272,15 @@ class Session:
         :return: dictionary with session data
         """
         return {
-            "session_id": str(self.session_id),
+            "session_id": self.session_id,
             "goal": self.goal,
             "time_available": self.time_available,
             "status": self.status,
             "current_task": self.current_task,
             "created_at": self.created_at,
+            "created_ts": self.created_ts,
             "tasks": [task.to_dict() for task in self.tasks],
+            "version": self.version,
         }
 
 
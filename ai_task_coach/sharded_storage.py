@@ -0,0 +1,126 @@
+"""
+sharded_storage.py
+Stores each session in its own file, plus a small manifest.
+
+Layout:
+    data/sessions/
+        manifest.json              {session_id: {status, goal, created_at, created_ts,
+                                                    task_count}}
+        8ccacbf0-0ec4-....json     one Session.to_dict() per file
+        8b5659e0-76e4-....json
+
+Saving a session rewrites only that session's file. The manifest is only
+rewritten when something it lists changes (status, goal, created_at, or
+number of tasks), so moving to the next task doesn't touch it at all.
+Reading one session opens only its own file.
+"""
+
+import json
+import os
+from storage import Storage
+
+# Session fields copied into the manifest, so listing sessions
+# (status index, history page) never opens the session files
+MANIFEST_FIELDS = ["status", "goal", "created_at", "created_ts"]
+
+
+class ShardedStorage(Storage):
+    def __init__(
+        self,
+        directory="data/sessions",
+        **kwargs,
+    ):
+        """
+        Create sharded storage handler.
+
+        :param directory: folder holding the manifest and one file per session
+        :param kwargs: other Storage options (durability, archive_after_days, ...)
+        """
+        self.directory = directory
+        super().__init__(os.path.join(directory, "manifest.json"), **kwargs)
+
+    def _shard_filename(self, session_id):
+        """
+        Get the path of one session's file.
+
+        :param session_id: session ID string
+        :return: file path
+        """
+        return os.path.join(self.directory, f"{session_id}.json")
+
+    def _manifest_entry(self, session_dict):
+        """
+        Build the manifest entry for a session.
+
+        :param session_dict: dictionary from Session.to_dict()
+        :return: small dictionary with the listing fields
+        """
+        entry = {field: session_dict.get(field) for field in MANIFEST_FIELDS}
+        entry["task_count"] = len(session_dict.get("tasks", []))
+        return entry
+
+    def _read_session(self, session_id):
+        """
+        Read one session's file.
+
+        :param session_id: session ID string
+        :return: dictionary from Session.to_dict(), or None if not found
+        """
+        try:
+            with open(self._shard_filename(session_id), "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _snapshot_session(self, data, session_id):
+        """
+        Read a session's own file for a snapshot.
+        Shards are replaced atomically, so this is always a whole session,
+        though it may be newer than the rest of the snapshot.
+
+        :param data: the snapshot's manifest
+        :param session_id: session ID string
+        :return: dictionary from Session.to_dict(), or None if gone
+        """
+        return self._read_session(session_id)
+
+    def _write_sessions(self, items):
+        """
+        Rewrite each session's file, and the manifest once if any entry changed.
+
+        :param items: list of (session ID string, dictionary from Session.to_dict())
+        """
+        data = self._load_file()
+        changed = {}
+        for session_id, session_dict in items:
+            self._write_atomically(
+                self._shard_filename(session_id),
+                lambda file, session_dict=session_dict: json.dump(session_dict, file),
+            )
+            entry = self._manifest_entry(session_dict)
+            if data.get(session_id) != entry:
+                changed[session_id] = entry
+
+        if changed:
+            data = dict(data)  # Copy - the old version may be in use
+            data.update(changed)
+            self._changes.update(changed)
+            self._save_file(data)
+
+    def _remove_sessions(self, session_ids):
+        """
+        Drop sessions from the manifest, then delete their files.
+
+        :param session_ids: list of session ID strings
+        """
+        super()._remove_sessions(session_ids)
+
+        for session_id in session_ids:
+            try:
+                os.unlink(self._shard_filename(session_id))
+            except FileNotFoundError:
+                pass
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,643 @@
+"""
+sqlite_storage.py
+Saves and loads sessions with SQLite instead of one big JSON file.
+
+Same public methods as storage.Storage, so it can be swapped in directly.
+Sessions and tasks live in separate tables:
+
+    sessions: session_id | goal | time_available | status | current_task | created_at | version
+    tasks:    session_id | position | task_number | description | timer_minutes | status
+              | started_at | finished_at
+
+The version column is bumped on every save; saving a Session whose version
+no longer matches raises StorageConflictError, like storage.Storage.
+
+Indexes on status, created_at and session_id turn the history page and the
+completed-count lookup into indexed queries instead of full scans.
+"""
+
+import itertools
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from session import CREATED_AT_FORMAT, Session, format_created_at, session_created_ts
+from storage import (
+    DEFAULT_IMPORT_BATCH,
+    DURABILITY_MODES,
+    HISTORY_ORDERS,
+    SessionSummary,
+    StorageConflictError,
+    import_batches,
+)
+from task import Task
+from task_table import TaskTable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    goal TEXT NOT NULL,
+    time_available INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    current_task INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    session_id TEXT NOT NULL REFERENCES sessions(session_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    task_number INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    timer_minutes INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    started_at INTEGER,
+    finished_at INTEGER,
+    PRIMARY KEY (session_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions(status);
+CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions(created_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_session_id ON tasks(session_id);
+"""
+
+# Columns added after the first release: (table, column, definition)
+ADDED_COLUMNS = [
+    ("sessions", "version", "INTEGER NOT NULL DEFAULT 0"),
+    ("tasks", "started_at", "INTEGER"),
+    ("tasks", "finished_at", "INTEGER"),
+]
+
+SESSION_COLUMNS = (
+    "session_id, goal, time_available, status, current_task, created_at, version"
+)
+
+UNFINISHED_STATUSES = ("paused", "in_progress")
+
+# Sessions read per query in export_stream()
+EXPORT_PAGE_SIZE = 500
+
+# How each durability mode maps onto SQLite's own sync setting.
+# "batch" uses WAL, where NORMAL only syncs at checkpoints.
+SYNCHRONOUS = {"none": "OFF", "batch": "NORMAL", "always": "FULL"}
+
+
+def _created_at_string(moment):
+    """
+    Convert a datetime or epoch seconds to a created_at string.
+
+    :param moment: datetime, or seconds since the epoch
+    :return: string in CREATED_AT_FORMAT
+    """
+    if not isinstance(moment, datetime):
+        moment = datetime.fromtimestamp(moment)
+    return moment.strftime(CREATED_AT_FORMAT)
+
+
+class SqliteStorage:
+    def __init__(self, filename="data/sessions.db", durability="none"):
+        """
+        Create SQLite storage handler.
+
+        :param filename: path to the SQLite database file
+        :param durability: "none", "batch", or "always" (see storage.DURABILITY_MODES)
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"durability must be one of {DURABILITY_MODES}, not {durability!r}"
+            )
+
+        self.filename = filename
+        self.durability = durability
+
+        # Create parent directory if it doesn't exist
+        directory = os.path.dirname(self.filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Streamlit calls us from different threads, so share one
+        # connection and serialize access to it
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+        self._conn = sqlite3.connect(self.filename, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if durability == "batch":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(f"PRAGMA synchronous = {SYNCHRONOUS[durability]}")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._add_missing_columns()
+
+    def _add_missing_columns(self):
+        """Add columns to databases created before they existed."""
+        for table, column, definition in ADDED_COLUMNS:
+            columns = [
+                row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")
+            ]
+            if column not in columns:
+                self._conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {column} {definition}"
+                )
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several changes into one SQLite transaction.
+        Changes commit when the outermost block exits, or roll back on error.
+        """
+        with self._lock:
+            self._transaction_depth += 1
+            try:
+                if self._transaction_depth == 1:
+                    with self._conn:
+                        yield self
+                else:
+                    yield self
+            finally:
+                self._transaction_depth -= 1
+
+    def flush(self):
+        """Nothing to do - SQLite commits each write (or transaction) itself."""
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def save_session(self, session):
+        """
+        Save a session (add new or update existing).
+        Only succeeds if the stored row is still at the session's version.
+        If the session was loaded or saved before, only the changed
+        columns and task rows are updated.
+
+        :param session: Session object to save
+        :raises StorageConflictError: if the session was saved elsewhere meanwhile
+        """
+        session_id = str(session.session_id)
+
+        patch = session.to_patch()
+        if patch is not None:
+            with self.transaction():
+                if self._update_changed(session_id, session.version, patch):
+                    session.version += 1
+                    session.mark_saved()
+                    return
+            # Row is gone or at another version - the full save sorts it out
+        values = (
+            session.goal,
+            session.time_available,
+            session.status,
+            session.current_task,
+            session.created_at,
+        )
+
+        with self.transaction():
+            # Compare-and-swap in one statement, so no other writer can
+            # slip in between the version check and the update
+            cursor = self._conn.execute(
+                """
+                UPDATE sessions SET
+                    goal = ?, time_available = ?, status = ?,
+                    current_task = ?, created_at = ?, version = version + 1
+                WHERE session_id = ? AND version = ?
+                """,
+                values + (session_id, session.version),
+            )
+            if cursor.rowcount == 0:
+                row = self._conn.execute(
+                    "SELECT version FROM sessions WHERE session_id = ?",
+                    (session_id,),
+                ).fetchone()
+                if row is not None:
+                    raise StorageConflictError(session_id, session.version, row[0])
+                try:
+                    self._conn.execute(
+                        """
+                        INSERT INTO sessions
+                            (goal, time_available, status, current_task, created_at,
+                             session_id, version)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        values + (session_id, session.version + 1),
+                    )
+                except sqlite3.IntegrityError:
+                    # Another process inserted it first
+                    raise StorageConflictError(session_id, session.version, None)
+            # Tasks can be regenerated wholesale, so replace them all
+            self._conn.execute("DELETE FROM tasks WHERE session_id = ?", (session_id,))
+            self._insert_tasks(
+                session_id,
+                [
+                    (
+                        task.task_number,
+                        task.description,
+                        task.timer_minutes,
+                        task.status,
+                        task.started_at,
+                        task.finished_at,
+                    )
+                    for task in session.tasks
+                ],
+            )
+            session.version += 1
+            session.mark_saved()
+
+    def _insert_tasks(self, session_id, task_rows):
+        """
+        Insert a session's task rows, in order. Caller holds a transaction.
+
+        :param session_id: session ID string
+        :param task_rows: list of (task_number, description, timer_minutes,
+            status, started_at, finished_at) tuples
+        """
+        self._conn.executemany(
+            """
+            INSERT INTO tasks
+                (session_id, position, task_number, description, timer_minutes,
+                 status, started_at, finished_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (session_id, position) + tuple(task_row)
+                for position, task_row in enumerate(task_rows)
+            ],
+        )
+
+    def _update_changed(self, session_id, version, patch):
+        """
+        Update only the changed columns and task rows of a session.
+        Caller holds a transaction.
+
+        :param session_id: session ID string
+        :param version: version the session was loaded at
+        :param patch: dictionary from Session.to_patch()
+        :return: True if updated, False if the row isn't at that version
+        """
+        # created_ts is derived from the created_at column here
+        fields = {
+            name: value
+            for name, value in patch["fields"].items()
+            if name != "created_ts"
+        }
+        # Column names come from SESSION_FIELDS / TASK_FIELDS, never user input
+        assignments = "".join(f"{name} = ?, " for name in fields)
+        cursor = self._conn.execute(
+            f"""
+            UPDATE sessions SET {assignments}version = version + 1
+            WHERE session_id = ? AND version = ?
+            """,
+            (*fields.values(), session_id, version),
+        )
+        if cursor.rowcount == 0:
+            return False
+
+        for position, changes in patch["tasks"].items():
+            assignments = ", ".join(f"{name} = ?" for name in changes)
+            self._conn.execute(
+                f"UPDATE tasks SET {assignments} WHERE session_id = ? AND position = ?",
+                (*changes.values(), session_id, int(position)),
+            )
+        return True
+
+    def get_session_by_id(self, session_id):
+        """
+        Find a specific session by ID.
+
+        :param session_id: the ID to search for
+        :return: Session object, or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {SESSION_COLUMNS} FROM sessions WHERE session_id = ?",
+                (str(session_id),),
+            ).fetchone()
+            if row is None:
+                return None
+            return self._row_to_session(row)
+
+    def get_unfinished_session(self):
+        """
+        Get the most recent session that is not completed.
+
+        :return: Session object, or None if no unfinished session
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"""
+                SELECT {SESSION_COLUMNS} FROM sessions
+                WHERE status IN (?, ?)
+                ORDER BY created_at DESC
+                LIMIT 1
+                """,
+                UNFINISHED_STATUSES,
+            ).fetchone()
+            if row is None:
+                return None
+            return self._row_to_session(row)
+
+    def get_completed_sessions(self):
+        """
+        Get all completed sessions (history).
+
+        :return: list of Session objects
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {SESSION_COLUMNS} FROM sessions WHERE status = ? ORDER BY created_at",
+                ("completed",),
+            ).fetchall()
+            return [self._row_to_session(row) for row in rows]
+
+    def iter_completed(self, limit=None, offset=0, order="newest"):
+        """
+        Page through completed sessions without loading their tasks.
+
+        :param limit: maximum number of summaries (None for all)
+        :param offset: number of summaries to skip
+        :param order: "newest" or "oldest" first, by created_at
+        :return: generator of SessionSummary objects
+        """
+        if order not in HISTORY_ORDERS:
+            raise ValueError(f"order must be one of {HISTORY_ORDERS}, not {order!r}")
+
+        direction = "DESC" if order == "newest" else "ASC"
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT s.session_id, s.goal, s.created_at, s.status,
+                    (SELECT COUNT(*) FROM tasks t WHERE t.session_id = s.session_id)
+                FROM sessions s
+                WHERE s.status = ?
+                ORDER BY s.created_at {direction}
+                LIMIT ? OFFSET ?
+                """,
+                ("completed", -1 if limit is None else limit, offset),
+            ).fetchall()
+
+        for session_id, goal, created_at, status, task_count in rows:
+            yield SessionSummary(self, session_id, goal, created_at, status, task_count)
+
+    def get_sessions_between(self, start, end):
+        """
+        Get sessions created in a time window, oldest first.
+        created_at strings sort in time order, so this is a range scan
+        on the created_at index.
+
+        :param start: window start (datetime or epoch seconds), inclusive
+        :param end: window end (datetime or epoch seconds), exclusive
+        :return: list of Session objects
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT {SESSION_COLUMNS} FROM sessions
+                WHERE created_at >= ? AND created_at < ?
+                ORDER BY created_at
+                """,
+                (_created_at_string(start), _created_at_string(end)),
+            ).fetchall()
+            return [self._row_to_session(row) for row in rows]
+
+    def get_total_completed_count(self):
+        """
+        Get total number of completed sessions (all time).
+
+        :return: count of all completed sessions
+        """
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM sessions WHERE status = ?", ("completed",)
+            ).fetchone()
+            return count
+
+    def snapshot(self):
+        """
+        Get a read-only view with the same methods as StorageSnapshot.
+        Each SQLite query already sees one consistent state of the
+        database, so the storage serves as its own snapshot; separate
+        calls may see writes made in between.
+
+        :return: this storage
+        """
+        return self
+
+    def task_table(self, status="completed"):
+        """
+        Collect the tasks of every session with a status into one TaskTable.
+
+        :param status: session status
+        :return: TaskTable
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT s.session_id, t.task_number, t.timer_minutes, t.status
+                FROM sessions s LEFT JOIN tasks t ON t.session_id = s.session_id
+                WHERE s.status = ?
+                ORDER BY s.created_at, s.session_id, t.position
+                """,
+                (status,),
+            ).fetchall()
+
+        table = TaskTable()
+        for session_id, task_rows in itertools.groupby(rows, key=lambda row: row[0]):
+            table.add_session_dict(
+                {
+                    "session_id": session_id,
+                    "tasks": [
+                        {
+                            "task_number": task_number,
+                            "timer_minutes": timer_minutes,
+                            "status": task_status,
+                        }
+                        for _, task_number, timer_minutes, task_status in task_rows
+                        if task_status is not None  # Session without tasks
+                    ],
+                }
+            )
+        return table
+
+    def export_stream(self, fp):
+        """
+        Write every session as one JSON line each (see Storage.export_stream()).
+        Reads a page of sessions at a time, so the database is never locked
+        for the whole export.
+
+        :param fp: text file opened for writing
+        :return: number of sessions written
+        """
+        count = 0
+        last_id = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"""
+                    SELECT {SESSION_COLUMNS} FROM sessions
+                    WHERE session_id > ? ORDER BY session_id LIMIT ?
+                    """,
+                    (last_id, EXPORT_PAGE_SIZE),
+                ).fetchall()
+                sessions = [self._row_to_session(row) for row in rows]
+            if not sessions:
+                return count
+
+            for session in sessions:
+                fp.write(json.dumps(session.to_dict()) + "\n")
+            count += len(sessions)
+            last_id = sessions[-1].session_id
+
+    def import_stream(
+        self, fp, batch_size=DEFAULT_IMPORT_BATCH, skip=0, on_commit=None
+    ):
+        """
+        Load sessions from a file written by export_stream().
+        Works like Storage.import_stream(): same-ID sessions are replaced,
+        each batch commits in one transaction, and skip resumes an import.
+
+        :param fp: text file opened for reading
+        :param batch_size: sessions per transaction
+        :param skip: number of lines to skip (already imported)
+        :param on_commit: function called with the number of lines done after each batch
+        :return: number of lines done, skipped ones included
+        :raises ValueError: if a line is not a saved session
+        """
+        done = skip
+        for done, batch in import_batches(fp, batch_size, skip):
+            with self.transaction():
+                for session_dict in batch:
+                    self._replace_session(session_dict)
+            if on_commit is not None:
+                on_commit(done)
+        return done
+
+    def _replace_session(self, session_dict):
+        """
+        Store a saved session dictionary as it is. Caller holds a transaction.
+
+        :param session_dict: dictionary from Session.to_dict()
+        """
+        session_id = str(session_dict["session_id"])
+        created_ts = session_created_ts(session_dict)
+        if created_ts is None:
+            created_ts = datetime.now().timestamp()  # Like Session() without one
+        created_at = format_created_at(created_ts)
+
+        # Deleting the row also deletes its tasks
+        self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        self._conn.execute(
+            f"INSERT INTO sessions ({SESSION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                session_id,
+                session_dict.get("goal", "Unknown"),
+                session_dict.get("time_available", 60),
+                session_dict.get("status", "in_progress"),
+                session_dict.get("current_task", 0),
+                created_at,
+                session_dict.get("version", 0),
+            ),
+        )
+        self._insert_tasks(
+            session_id,
+            [
+                (
+                    task_dict.get("task_number", 0),
+                    task_dict.get("description", ""),
+                    task_dict.get("timer_minutes", 5),
+                    task_dict.get("status", "pending"),
+                    task_dict.get("started_at"),
+                    task_dict.get("finished_at"),
+                )
+                for task_dict in session_dict.get("tasks", [])
+            ],
+        )
+
+    def delete_session(self, session_id):
+        """
+        Delete a session by ID. Its tasks are removed by ON DELETE CASCADE.
+
+        :param session_id: the ID to delete
+        """
+        self.delete_sessions([session_id])
+
+    def delete_sessions(self, session_ids):
+        """
+        Delete many sessions in one transaction.
+
+        :param session_ids: IDs to delete (strings or UUIDs)
+        :return: number of sessions that were deleted
+        """
+        with self.transaction():
+            cursor = self._conn.executemany(
+                "DELETE FROM sessions WHERE session_id = ?",
+                [(str(session_id),) for session_id in session_ids],
+            )
+            return cursor.rowcount
+
+    def delete_where(self, status):
+        """
+        Delete every session with the given status (e.g. clear history).
+
+        :param status: "in_progress", "paused", or "completed"
+        :return: number of sessions that were deleted
+        """
+        with self.transaction():
+            cursor = self._conn.execute(
+                "DELETE FROM sessions WHERE status = ?", (status,)
+            )
+            return cursor.rowcount
+
+    def _row_to_session(self, row):
+        """
+        Convert a sessions row (plus its tasks) to a Session object.
+        Caller must hold self._lock.
+
+        :param row: tuple from the sessions table
+        :return: Session object
+        """
+        session_id, goal, time_available, status, current_task, created_at, version = (
+            row
+        )
+
+        task_rows = self._conn.execute(
+            """
+            SELECT task_number, description, timer_minutes, status,
+                started_at, finished_at
+            FROM tasks WHERE session_id = ? ORDER BY position
+            """,
+            (session_id,),
+        ).fetchall()
+        tasks = [
+            Task(
+                task_number=task_number,
+                description=description,
+                timer_minutes=timer_minutes,
+                status=task_status,
+                started_at=started_at,
+                finished_at=finished_at,
+            )
+            for (
+                task_number,
+                description,
+                timer_minutes,
+                task_status,
+                started_at,
+                finished_at,
+            ) in task_rows
+        ]
+
+        session = Session(
+            goal=goal,
+            time_available=time_available,
+            status=status,
+            tasks=tasks,
+            current_task=current_task,
+            session_id=session_id,
+            created_at=created_at,
+            version=version,
+        )
+        session.mark_saved()  # Matches what is stored
+        return session
+
+
+if __name__ == "__main__":
+    pass
@@ -32,77 +32,970 @@ Example:
         },
   "8b5659e0-76e4-46f8-8fd1-bd56063bdd3a": {...},
 }
+
+Several processes can share the same file. Writers take an exclusive
+lock on sessions.lock while they read-modify-write; readers never lock,
+because every write replaces the file atomically. Each session carries a
+version number, and saving a Session that someone else saved in the
+meantime raises StorageConflictError instead of overwriting their change.
+
+Readers can take a snapshot(): an immutable point-in-time view. Writers
+never change the published sessions dictionary in place - they build the
+next version and swap it in - so a snapshot stays consistent while others
+save, and taking one never waits for a writer.
+
+The index file next to it (sessions.index.json) also stores where each
+session's JSON starts in the data file, so one session can be read
+straight from those bytes without parsing everything else.
+
+The file can also be written in a smaller, faster binary format
+(codec="binary", see codec.py). Either format is read back, and an
+existing file is converted to the configured one when it is opened.
 """
 
+import atexit
+import bisect
+import itertools
 import json
-from session import Session
+import mmap
+import os
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from archive import Archive
+from codec import MAGIC, detect_codec, get_codec
+from session import CREATED_AT_FORMAT, Session, apply_patch, session_created_ts
 from task import Task
+from task_table import TaskTable
+
+try:
+    import fcntl
+except ImportError:  # Windows - only threads in this process are serialized
+    fcntl = None
 
 # Data: The entire file contents (all sessions)
 # Session: One single task breakdown
 # Path to the file where all sessions are stored
 
+# Statuses that count as "unfinished"
+# paused: user did it
+# in_progress: app closed unexpectedly
+UNFINISHED_STATUSES = ["paused", "in_progress"]
+
+# Sort orders accepted by iter_completed()
+HISTORY_ORDERS = ["newest", "oldest"]
+
+# How hard each write tries to reach the disk
+# none: write right away, no fsync (fastest, may lose data on power loss)
+# batch: collect writes for batch_window seconds, then one fsynced write
+# always: fsync every write
+DURABILITY_MODES = ["none", "batch", "always"]
+DEFAULT_BATCH_WINDOW = 0.5
+
+# Sessions per transaction in import_stream()
+DEFAULT_IMPORT_BATCH = 500
+
+
+class StorageConflictError(Exception):
+    def __init__(self, session_id, expected_version, actual_version):
+        """
+        Raised when saving a session that was saved elsewhere since it was loaded.
+
+        :param session_id: session ID string
+        :param expected_version: version the caller's Session was loaded at
+        :param actual_version: version currently stored
+        """
+        super().__init__(
+            f"Session {session_id} was changed elsewhere "
+            f"(stored version {actual_version}, expected {expected_version})"
+        )
+        self.session_id = session_id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+
+
+class SessionSummary:
+    def __init__(self, storage, session_id, goal, created_at, status, task_count):
+        """
+        Lightweight record for listing sessions (e.g. the history page).
+        Tasks are only loaded when load() is called.
+
+        :param storage: storage handler or snapshot the session came from
+        :param session_id: session ID string
+        :param goal: the session's goal
+        :param created_at: created time string
+        :param status: the session's status
+        :param task_count: number of tasks in the session
+        """
+        self._storage = storage
+        self.session_id = session_id
+        self.goal = goal
+        self.created_at = created_at
+        self.status = status
+        self.task_count = task_count
+
+    def load(self):
+        """
+        Load the full Session with all its tasks.
+
+        :return: Session object, or None if it no longer exists
+        """
+        return self._storage.get_session_by_id(self.session_id)
+
+
+class StorageSnapshot:
+    def __init__(
+        self, storage, data, status_ids, unfinished_ids, archived, index_version
+    ):
+        """
+        Read-only view of a Storage at one point in time.
+        Made by Storage.snapshot(); later writes never change it.
+
+        :param storage: storage handler it was taken from
+        :param data: sessions dictionary of that version (never changed in place)
+        :param status_ids: status -> tuple of IDs, least recently saved first
+        :param unfinished_ids: tuple of unfinished IDs, most recently saved first
+        :param archived: archive entries of that version (never changed in place)
+        :param index_version: the storage's status index version it was built from
+        """
+        self._storage = storage
+        self.data = data
+        self._status_ids = status_ids
+        self._unfinished_ids = unfinished_ids
+        self._archived = archived
+        self.index_version = index_version
+
+    def _session_dict(self, session_id):
+        """
+        Get the full dictionary for one session in this snapshot.
+
+        :param session_id: session ID string
+        :return: dictionary from Session.to_dict(), or None if not found
+        """
+        if session_id in self.data:
+            return self._storage._snapshot_session(self.data, session_id)
+        if session_id in self._archived:
+            return self._storage.archive.read(session_id)
+        return None
+
+    def get_session_by_id(self, session_id):
+        """
+        Find a specific session by ID.
+        Returns a private copy, not the storage's live object.
+
+        :param session_id: the ID to search for
+        :return: Session object, or None if not found or invalid
+        """
+        session_dict = self._session_dict(str(session_id))
+        if session_dict is None:
+            return None
+        return self._storage._dict_to_session(session_dict)
+
+    def get_unfinished_session(self):
+        """
+        Get the most recently saved session that is not completed.
+
+        :return: Session object, or None if no unfinished session
+        """
+        for session_id in self._unfinished_ids:
+            session = self.get_session_by_id(session_id)
+            if session:  # Skip if None (invalid data)
+                return session
+        return None
+
+    def iter_completed(self, limit=None, offset=0, order="newest"):
+        """
+        Page through completed sessions without building Session objects.
+
+        :param limit: maximum number of summaries (None for all)
+        :param offset: number of summaries to skip
+        :param order: "newest" or "oldest" first, by created_at
+        :return: generator of SessionSummary objects
+        """
+        if order not in HISTORY_ORDERS:
+            raise ValueError(f"order must be one of {HISTORY_ORDERS}, not {order!r}")
+        return self._iter_completed(limit, offset, order)
+
+    def _iter_completed(self, limit, offset, order):
+        """Generator behind iter_completed(), so bad arguments fail right away."""
+        # Archived sessions are all completed, and older than any hot one
+        session_ids = list(self._archived) + list(self._status_ids.get("completed", ()))
+        meta = {
+            session_id: self.data.get(session_id) or self._archived.get(session_id)
+            for session_id in session_ids
+        }
+        session_ids.sort(
+            key=lambda session_id: str(meta[session_id].get("created_at")),
+            reverse=(order == "newest"),
+        )
+
+        stop = None if limit is None else offset + limit
+        for session_id in itertools.islice(session_ids, offset, stop):
+            session_dict = meta[session_id]
+            yield SessionSummary(
+                self,
+                session_id,
+                goal=session_dict.get("goal", "Unknown"),
+                created_at=session_dict.get("created_at"),
+                status=session_dict.get("status"),
+                task_count=session_dict.get(
+                    "task_count", len(session_dict.get("tasks", []))
+                ),
+            )
+
+    def get_total_completed_count(self):
+        """
+        Get total number of completed sessions (all time).
+
+        :return: count of all completed sessions
+        """
+        return len(self._status_ids.get("completed", ())) + len(self._archived)
+
+    def iter_session_dicts(self):
+        """
+        Go through every session in this snapshot, archived ones first,
+        reading one at a time.
+
+        :return: generator of dictionaries from Session.to_dict()
+        """
+        if self._archived:
+            for session_id, session_dict in self._storage.archive.iter_sessions():
+                if session_id in self._archived:
+                    yield session_dict
+
+        for session_id in self.data:
+            session_dict = self._storage._snapshot_session(self.data, session_id)
+            if session_dict is not None:
+                yield session_dict
+
+    def task_table(self, status="completed"):
+        """
+        Collect the tasks of every session with a status into one TaskTable,
+        for bulk statistics without building Session or Task objects.
+
+        :param status: session status ("completed" includes archived sessions)
+        :return: TaskTable
+        """
+        table = TaskTable()
+        if status == "completed" and self._archived:
+            # One pass over the segments instead of one search per session
+            for session_id, session_dict in self._storage.archive.iter_sessions():
+                if session_id in self._archived:
+                    table.add_session_dict(session_dict)
+
+        for session_id in self._status_ids.get(status, ()):
+            session_dict = self._session_dict(session_id)
+            if session_dict is not None:
+                table.add_session_dict(session_dict)
+        return table
+
+
+def _epoch_seconds(moment):
+    """
+    Convert a datetime to epoch seconds; numbers are returned unchanged.
+
+    :param moment: datetime, or seconds since the epoch
+    :return: seconds since the epoch
+    """
+    if isinstance(moment, datetime):
+        return moment.timestamp()
+    return moment
+
+
+def import_batches(fp, batch_size=DEFAULT_IMPORT_BATCH, skip=0):
+    """
+    Read a file written by export_stream() in batches, one line at a time,
+    so only one batch is ever in memory.
+
+    :param fp: text file opened for reading
+    :param batch_size: sessions per batch
+    :param skip: number of lines to skip (already imported)
+    :return: generator of (lines done so far, list of session dictionaries)
+    :raises ValueError: if a line is not a saved session
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, not {batch_size!r}")
+
+    batch = []
+    line_number = skip
+    for line_number, line in enumerate(itertools.islice(fp, skip, None), skip + 1):
+        if not line.strip():
+            continue
+        try:
+            session_dict = json.loads(line)
+        except json.JSONDecodeError:
+            raise ValueError(f"Line {line_number} is not valid JSON")
+        if not isinstance(session_dict, dict) or not session_dict.get("session_id"):
+            raise ValueError(f"Line {line_number} is not a saved session")
+        batch.append(session_dict)
+        if len(batch) >= batch_size:
+            yield line_number, batch
+            batch = []
+
+    if batch:
+        yield line_number, batch
+
+
+def _flush_at_exit(storage_ref):
+    """
+    Write any batched changes when the program exits.
+
+    :param storage_ref: weak reference to a Storage
+    """
+    storage = storage_ref()
+    if storage is not None:
+        storage.flush()
+
 
 class Storage:
-    def __init__(self, filename="data/sessions.json"):
+    def __init__(
+        self,
+        filename="data/sessions.json",
+        durability="none",
+        batch_window=DEFAULT_BATCH_WINDOW,
+        archive_after_days=None,
+        archive_dir=None,
+        codec="json",
+    ):
         """
         Create storage handler.
         Saves/loads session data to/from a JSON file.
 
         :param filename: path to the JSON file
+        :param durability: "none", "batch", or "always" (see DURABILITY_MODES)
+        :param batch_window: seconds to collect writes for in "batch" mode
+        :param archive_after_days: move completed sessions older than this
+            into compressed archive segments (None to keep everything hot)
+        :param archive_dir: archive folder (default: "archive" next to the file)
+        :param codec: file format to write, "json" or "binary" (see codec.py)
         """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"durability must be one of {DURABILITY_MODES}, not {durability!r}"
+            )
+
         self.filename = filename
+        self.durability = durability
+        self.codec = get_codec(codec)
+        self.batch_window = batch_window
+        self.index_filename = os.path.splitext(filename)[0] + ".index.json"
+        self.lock_filename = os.path.splitext(filename)[0] + ".lock"
+
+        # Parsed file contents kept in memory, plus the (mtime, size, inode)
+        # of the file they came from. A rerun only costs one stat() call.
+        # Never changed in place once published (see _publish()).
+        self._cache = None
+        self._cache_stamp = None
+
+        # Last snapshot handed to readers (see snapshot())
+        self._snapshot = None
+
+        # Status index: status -> {session_id: None} (an ordered set,
+        # least recently saved first), plus a save sequence number per session.
+        # Built for one specific cached dict (self._index_data).
+        self._status_index = None
+        self._sequence = None
+        self._next_sequence = 0
+        self._index_data = None
+        self._index_version = 0  # Bumped on every change, for snapshot()
+
+        # Time index: sorted list of (created_ts, session_id), hot and
+        # archived, plus session_id -> created_ts to find entries again.
+        # Built on first use by get_sessions_between(), then kept up to date.
+        self._time_index = None
+        self._created_ts = None
+
+        # Identity map: session_id -> the one live Session object handed out
+        # for it, so repeated reads don't build divergent copies.
+        # Only valid for the file stamp it was read under (self._live_stamp).
+        self._live = {}
+        self._live_stamp = None
+
+        # Byte offset index: session_id -> [offset, length] of its JSON in
+        # the data file, so one session can be read without parsing the rest
+        self._offsets = None
+        self._offsets_stamp = None
+
+        # Write batching: changes made inside transaction() or within the
+        # batch window stay in the cache until flush() writes them once
+        self._write_lock = threading.RLock()
+        self._transaction_depth = 0
+        self._dirty = False
+        self._flush_timer = None
+        if durability == "batch":
+            atexit.register(_flush_at_exit, weakref.ref(self))
+
+        # Changes not yet written: session_id -> dict, or None if removed.
+        # Replayed onto the file if another process wrote it in the meantime.
+        self._changes = {}
+
+        # Lock file shared with other processes, held while writing
+        self._lock_file = None
+        self._lock_depth = 0
+
+        # Cold tier for old completed sessions
+        self.archive_after_days = archive_after_days
+        self.archive = None
+        if archive_after_days is not None:
+            self.archive = Archive(
+                archive_dir or os.path.join(os.path.dirname(filename), "archive")
+            )
+
         self._initialize()
 
     def _initialize(self):
         """Create the data directory and file if they don't exist."""
-        import os
-
         # Create parent directory if it doesn't exist
         directory = os.path.dirname(self.filename)
         if directory and not os.path.exists(directory):
             os.makedirs(directory)
 
-        data = self._load_file()
-        if data == {}:
-            self._save_file({})
+        # Only check the size - parsing the file here would defeat the cache
+        # and the offset index on every start
+        with self._locked():
+            stamp = self._file_stamp()
+            if stamp is None or stamp[1] == 0:
+                self._save_file({})
+                self.flush()  # Create the file now, even in "batch" mode
+            elif self._file_codec() is not self.codec:
+                # Written in the other format - convert it once, now
+                self._save_file(self._load_file())
+                self.flush()
+
+        if self.archive is not None:
+            self.archive_old_sessions()
 
     def _save_file(self, data):
         """
         Save dictionary to JSON file.
+        Inside a transaction or in "batch" mode the write is deferred
+        until flush().
+
+        :param data: dictionary to save
+        """
+        with self._write_lock:
+            # Write-through: the dict we just saved is the new cached copy
+            self._publish(data)
+
+            if self._transaction_depth > 0:
+                self._dirty = True
+            elif self.durability == "batch":
+                self._dirty = True
+                self._schedule_flush()
+            else:
+                self._write_file(data)
+
+    def _write_file(self, data):
+        """
+        Write dictionary to the JSON file right now.
+
+        :param data: dictionary to save
+        """
+        with self._locked():
+            data = self._merge_external_changes(data)
+            self._write_data(data)
+
+    def _write_data(self, data):
+        """
+        Write the sessions dictionary and its index. Caller holds the lock.
 
         :param data: dictionary to save
         """
-        with open(self.filename, "w") as file:
-            json.dump(data, file)
+        offsets = []
+        self._write_atomically(
+            self.filename,
+            lambda file: offsets.append(self.codec.dump(data, file)),
+            binary=True,
+        )
+        self._dirty = False
+        self._changes = {}
+        self._mark_written()
+
+        self._offsets = offsets[0]  # None if the codec can't tell
+        self._offsets_stamp = self._cache_stamp
+        self._persist_index()
+
+    def _merge_external_changes(self, data):
+        """
+        Replay our unwritten changes onto the file if another process
+        wrote it since we loaded it, so neither side's changes are lost.
+        A session that was saved at a newer version elsewhere keeps that
+        version (first writer wins, as with save_session()).
+
+        :param data: our copy of the sessions dictionary
+        :return: dictionary to write
+        """
+        if self._cache_stamp is None or self._file_stamp() == self._cache_stamp:
+            return data  # Nobody else wrote - our copy is current
+
+        merged = self._read_file()
+        for session_id, session_dict in self._changes.items():
+            if session_dict is None:
+                merged.pop(session_id, None)
+                continue
+            stored = merged.get(session_id)
+            if (
+                stored is not None
+                and "version" in session_dict
+                and stored.get("version", 0) >= session_dict["version"]
+            ):
+                continue  # Conflict - their save came first
+            merged[session_id] = session_dict
+
+        # Our cached copy, index and live objects no longer match the file
+        self._cache = merged
+        self._live = {}
+        return merged
+
+    def _publish(self, data):
+        """
+        Make a new version of the sessions dictionary the current one.
+        Writers copy the dictionary instead of changing it in place, so
+        readers and snapshots holding the old version stay consistent.
+
+        :param data: the new sessions dictionary
+        """
+        if self._cache is not None and self._index_data is self._cache:
+            self._index_data = data  # Callers update the index before writing
+        self._cache = data
+
+    def snapshot(self):
+        """
+        Get a consistent, read-only view of all sessions.
+
+        Reuses the last snapshot while nothing has changed. If another
+        thread is in the middle of a write, returns the last published
+        snapshot instead of waiting for it.
+
+        :return: StorageSnapshot
+        """
+        snapshot = self._snapshot
+        if (
+            snapshot is not None
+            and snapshot.data is self._cache
+            and snapshot.index_version == self._index_version
+            and (self.archive is None or snapshot._archived is self.archive.entries)
+        ):
+            if self._dirty or self._file_stamp() == self._cache_stamp:
+                return snapshot
+
+        if not self._write_lock.acquire(blocking=snapshot is None):
+            return snapshot  # A writer is busy - read the previous version
+        try:
+            self._ensure_index()
+            status_ids = {
+                status: tuple(ids) for status, ids in self._status_index.items()
+            }
+            unfinished_ids = []
+            for status in UNFINISHED_STATUSES:
+                unfinished_ids.extend(status_ids.get(status, ()))
+            unfinished_ids.sort(key=self._sequence.get, reverse=True)
+
+            self._snapshot = StorageSnapshot(
+                self,
+                self._index_data,
+                status_ids,
+                tuple(unfinished_ids),
+                self.archive.entries if self.archive is not None else {},
+                self._index_version,
+            )
+            return self._snapshot
+        finally:
+            self._write_lock.release()
+
+    def _snapshot_session(self, data, session_id):
+        """
+        Get one session's full dictionary for a snapshot.
+        Subclasses whose data file only lists sessions override this.
+
+        :param data: the snapshot's sessions dictionary
+        :param session_id: session ID string
+        :return: dictionary from Session.to_dict()
+        """
+        return data[session_id]
+
+    @contextmanager
+    def _locked(self):
+        """
+        Hold the write lock for this process and the lock file shared with
+        other processes. Re-entrant, so nested writes only lock once.
+        Readers don't need it - the data file is always replaced atomically.
+        """
+        with self._write_lock:
+            if self._lock_depth == 0 and fcntl is not None:
+                self._lock_file = open(self.lock_filename, "a")
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and self._lock_file is not None:
+                    self._lock_file.close()  # Releases the lock
+                    self._lock_file = None
+
+    def _mark_written(self):
+        """Remember the file stamp after one of our own writes."""
+        self._cache_stamp = self._file_stamp()
+        # Our own write doesn't make the live Session objects stale
+        self._live_stamp = self._cache_stamp
+
+    def _write_atomically(self, path, write, binary=False):
+        """
+        Write a file via a temp file + rename, so readers and crashes
+        only ever see the old or the new contents.
+
+        :param path: file to replace
+        :param write: function that writes the contents to an open file
+        :param binary: open the temp file in binary mode
+        """
+        directory = os.path.dirname(path) or "."
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb" if binary else "w") as file:
+                write(file)
+                if self.durability != "none":
+                    file.flush()
+                    os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def _schedule_flush(self):
+        """Start the batch timer if it isn't already running."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.batch_window, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Write any deferred changes to disk now."""
+        with self._locked():
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._dirty:
+                self._write_file(self._cache)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several changes into one write.
+
+        Example:
+            with storage.transaction():
+                storage.save_session(session)
+                storage.delete_session(old_id)
+
+        Changes are written when the outermost block exits.
+        Other threads' and processes' writes wait until then.
+        """
+        with self._locked():
+            self._transaction_depth += 1
+            try:
+                yield self
+            finally:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self.flush()
+
+    def _file_stamp(self):
+        """
+        Get a cheap fingerprint of the data file.
+
+        :return: (mtime_ns, size, inode) tuple, or None if file doesn't exist
+        """
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
 
     def _load_file(self):
         """
-        Load dictionary from JSON file
+        Load dictionary from JSON file.
+        Returns the cached copy unless the file changed on disk.
 
         :return: dictionary or empty dict if file doesn't exist
         """
+        stamp = self._file_stamp()
+        if self._cache is not None and (self._dirty or stamp == self._cache_stamp):
+            # Unwritten changes win over whatever is on disk
+            return self._cache
+
+        self._cache = self._read_file()
+        self._cache_stamp = stamp
+        return self._cache
+
+    def _cache_is_fresh(self):
+        """
+        Check if the cached data can be used without touching the file.
+
+        :return: True if the cache matches the file (or has unwritten changes)
+        """
+        if self._cache is None:
+            return False
+        return self._dirty or self._file_stamp() == self._cache_stamp
+
+    def _read_file(self):
+        """
+        Read and parse the data file from disk, in whichever format it is.
+
+        :return: dictionary or empty dict if file doesn't exist
+        :raises ValueError: if a binary file is damaged or from a newer version
+        """
         try:
-            with open(self.filename, "r") as file:
-                return json.load(file)
+            with open(self.filename, "rb") as file:
+                raw = file.read()
         except FileNotFoundError:  # If file doesn't exist
             return {}
+
+        try:
+            return detect_codec(raw).load(raw)
         except json.JSONDecodeError:  # If file is empty
             return {}
 
+    def _file_codec(self):
+        """
+        Find out which format the data file is in.
+
+        :return: codec object, or None if the file doesn't exist
+        """
+        try:
+            with open(self.filename, "rb") as file:
+                return detect_codec(file.read(len(MAGIC)))
+        except FileNotFoundError:
+            return None
+
+    def _ensure_index(self):
+        """
+        Make sure the status index matches the current data.
+        Uses the index file next to the data if it is up to date,
+        otherwise rebuilds it from the data.
+        """
+        data = self._load_file()
+        if self._index_data is data:
+            return
+
+        entries = self._load_index_file()
+        if entries is None:
+            # Oldest first, so the last unfinished one is the most recent
+            entries = [
+                (session_id, session_dict.get("status"))
+                for session_id, session_dict in sorted(
+                    data.items(), key=lambda item: str(item[1].get("created_at"))
+                )
+            ]
+
+        self._status_index = {}
+        self._sequence = {}
+        self._next_sequence = 0
+        self._index_data = data
+        self._time_index = None  # Rebuilt from the new data when next needed
+        for session_id, status in entries:
+            self._index_put(session_id, status)
+
+    def _index_put(self, session_id, status):
+        """
+        Record a session's status as the most recently saved one.
+
+        :param session_id: session ID string
+        :param status: the session's status
+        """
+        self._index_remove(session_id)
+        self._index_version += 1
+        self._status_index.setdefault(status, {})[session_id] = None
+        self._sequence[session_id] = self._next_sequence
+        self._next_sequence += 1
+
+    def _ensure_time_index(self):
+        """Build the created_ts index from the current data if needed."""
+        self._ensure_index()
+        if self._time_index is not None:
+            return
+
+        created = {}
+        sources = [self._index_data]
+        if self.archive is not None:
+            sources.insert(0, self.archive.entries)
+        for source in sources:
+            for session_id, session_dict in source.items():
+                created_ts = session_created_ts(session_dict)
+                if created_ts is not None:
+                    created[session_id] = created_ts
+
+        self._created_ts = created
+        self._time_index = sorted(
+            (created_ts, session_id) for session_id, created_ts in created.items()
+        )
+
+    def _time_index_put(self, session_id, created_ts):
+        """
+        Add or move a session in the time index, if it has been built.
+
+        :param session_id: session ID string
+        :param created_ts: created time in epoch seconds
+        """
+        if self._time_index is None:
+            return
+        if self._created_ts.get(session_id) == created_ts:
+            return
+        self._time_index_remove(session_id)
+        bisect.insort(self._time_index, (created_ts, session_id))
+        self._created_ts[session_id] = created_ts
+
+    def _time_index_remove(self, session_id):
+        """
+        Drop a deleted session from the time index, if it has been built.
+
+        :param session_id: session ID string
+        """
+        if self._time_index is None:
+            return
+        created_ts = self._created_ts.pop(session_id, None)
+        if created_ts is None:
+            return
+        position = bisect.bisect_left(self._time_index, (created_ts, session_id))
+        del self._time_index[position]
+
+    def _index_remove(self, session_id):
+        """
+        Drop a session from the status index.
+
+        :param session_id: session ID string
+        """
+        if self._sequence.pop(session_id, None) is None:
+            return
+        self._index_version += 1
+        for ids in self._status_index.values():
+            ids.pop(session_id, None)
+
+    def _status_ids(self, status):
+        """
+        Get IDs of sessions with the given status, least recently saved first.
+
+        :param status: session status
+        :return: list of session ID strings
+        """
+        self._ensure_index()
+        session_ids = list(self._status_index.get(status, {}))
+
+        # Archived sessions are all completed, and older than any hot one
+        if status == "completed" and self.archive is not None:
+            session_ids = list(self.archive.entries) + session_ids
+
+        return session_ids
+
+    def _session_meta(self, session_id):
+        """
+        Get the listing fields (goal, status, created_at...) for a session,
+        whether it is in the data file or the archive.
+        Call _ensure_index() first.
+
+        :param session_id: session ID string
+        :return: dictionary, or None if not found
+        """
+        session_dict = self._index_data.get(session_id)
+        if session_dict is None and self.archive is not None:
+            session_dict = self.archive.entries.get(session_id)
+        return session_dict
+
+    def _read_index_file(self, stamp):
+        """
+        Read the index file saved next to the data, if it was written
+        for the given version of the data file.
+
+        :param stamp: file stamp the index must match
+        :return: saved dictionary, or None if missing/stale
+        """
+        try:
+            with open(self.index_filename, "r") as file:
+                saved = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if not isinstance(saved, dict) or saved.get("stamp") is None:
+            return None
+        if stamp is None or tuple(saved["stamp"]) != stamp:
+            return None
+        return saved
+
+    def _load_index_file(self):
+        """
+        Read the saved status index, if it was written for the current data file.
+
+        :return: list of (session_id, status) pairs, or None if missing/stale
+        """
+        if self._dirty:
+            return None  # Cached data has changes the saved index doesn't know
+        saved = self._read_index_file(self._file_stamp())
+        if saved is None or "sessions" not in saved:
+            return None
+        return [tuple(entry) for entry in saved["sessions"]]
+
+    def _persist_index(self):
+        """Save the status index and byte offsets next to the data file."""
+        saved = {"stamp": list(self._cache_stamp) if self._cache_stamp else None}
+        if self._offsets is not None:  # The binary format has none
+            saved["offsets"] = self._offsets
+
+        # The status index is only saved if it describes what was just written
+        if self._index_data is self._cache and self._sequence is not None:
+            ordered = sorted(self._sequence, key=self._sequence.get)
+            statuses = {}
+            for status, ids in self._status_index.items():
+                for session_id in ids:
+                    statuses[session_id] = status
+            saved["sessions"] = [
+                [session_id, statuses[session_id]] for session_id in ordered
+            ]
+
+        self._write_atomically(self.index_filename, lambda file: json.dump(saved, file))
+
     def save_session(self, session):
         """
         Save a session (add new or update existing).
+        Only succeeds if the stored copy is still at the version the
+        session was loaded at; the session's version then goes up by one.
+        If the session was loaded or saved before, only its changed
+        fields are written (see Session.to_patch()).
 
         :param session: Session object to save
+        :raises StorageConflictError: if the session was saved elsewhere meanwhile
         """
-        data = self._load_file()  # Load all existing data
-        session_dict = (
-            session.to_dict()
-        )  # Convert Session object -> dictionary to save in JSON
-        data[str(session.session_id)] = session_dict
+        session_id = str(session.session_id)
 
-        self._save_file(data)
+        with self._locked():
+            stored = self._read_session(session_id)
+            stored_version = stored.get("version", 0) if stored else 0
+            if stored is not None and stored_version != session.version:
+                # Our copy is stale - make the next read return the stored one
+                self._live.pop(session_id, None)
+                raise StorageConflictError(session_id, session.version, stored_version)
+
+            patch = session.to_patch() if stored is not None else None
+
+            self._ensure_index()
+            # Index first: writing the data file also saves the index next to it
+            self._index_put(session_id, session.status)
+            self._time_index_put(session_id, session.created_ts)
+            if patch is not None:
+                patch["fields"]["version"] = stored_version + 1
+                self._patch_session(session_id, stored, patch)
+            else:
+                session_dict = (
+                    session.to_dict()
+                )  # Convert Session object -> dictionary to save in JSON
+                session_dict["version"] = stored_version + 1
+                self._write_session(session_id, session_dict)
+
+            session.version = stored_version + 1
+            session.mark_saved()
+            self._remember_session(session_id, session)
 
     def get_session_by_id(self, session_id):
         """
@@ -111,31 +1004,30 @@ class Storage:
         :param session_id: the ID to search for
         :return: Session object, or None if not found or invalid
         """
-        data = self._load_file()
-
         session_id_str = str(session_id)  # Convert to string in case UUID is passed
 
-        if session_id_str in data:
-            session = self._dict_to_session(data[session_id_str])
-            return session  # May be None if data is invalid
-
-        return None
+        # Doesn't load the whole file if the offset index is up to date
+        return self._live_session(session_id_str)  # May be None if data is invalid
 
     def get_unfinished_session(self):
         """
-        Get the first session that is not completed.
+        Get the most recently saved session that is not completed.
         paused: user did it
         in_progress: app closed unexpectedly
 
         :return: Session object, or None if no unfinished session
         """
-        data = self._load_file()
+        candidates = []
+        for status in UNFINISHED_STATUSES:
+            candidates.extend(self._status_ids(status))
+
+        # Usually there is just one, so sorting is cheap
+        candidates.sort(key=self._sequence.get, reverse=True)
 
-        for session_id, session_dict in data.items():
-            if session_dict.get("status") in ["paused", "in_progress"]:
-                session = self._dict_to_session(session_dict)
-                if session:  # Skip if None (invalid data)
-                    return session
+        for session_id in candidates:
+            session = self._live_session(session_id)
+            if session:  # Skip if None (invalid data)
+                return session
 
         return None
 
@@ -145,44 +1037,376 @@ class Storage:
 
         :return: list of Session objects
         """
-        data = self._load_file()
         completed = []
-
-        for session_id, session_dict in data.items():
-            if session_dict.get("status") == "completed":
-                session = self._dict_to_session(session_dict)
-                if session:  # Skip if None (invalid data)
-                    completed.append(session)
+        for session_id in self._status_ids("completed"):
+            session = self._live_session(session_id)
+            if session:  # Skip if None (invalid data)
+                completed.append(session)
 
         return completed
 
+    def iter_completed(self, limit=None, offset=0, order="newest"):
+        """
+        Page through completed sessions without building Session objects.
+        Reads from one snapshot, so pages stay consistent while others save.
+
+        :param limit: maximum number of summaries (None for all)
+        :param offset: number of summaries to skip
+        :param order: "newest" or "oldest" first, by created_at
+        :return: generator of SessionSummary objects
+        """
+        return self.snapshot().iter_completed(limit, offset, order)
+
     def get_total_completed_count(self):
         """
         Get total number of completed sessions (all time).
 
         :return: count of all completed sessions
         """
-        data = self._load_file()
-        count = 0
+        return self.snapshot().get_total_completed_count()
 
-        for session_id, session_dict in data.items():
-            if session_dict.get("status") == "completed":
-                count += 1
+    def get_sessions_between(self, start, end):
+        """
+        Get sessions created in a time window, oldest first.
+        Found by binary search in a sorted index, not by scanning every session.
+
+        :param start: window start (datetime or epoch seconds), inclusive
+        :param end: window end (datetime or epoch seconds), exclusive
+        :return: list of Session objects
+        """
+        start = _epoch_seconds(start)
+        end = _epoch_seconds(end)
+
+        with self._write_lock:
+            self._ensure_time_index()
+            low = bisect.bisect_left(self._time_index, (start,))
+            high = bisect.bisect_left(self._time_index, (end,))
+            session_ids = [session_id for _, session_id in self._time_index[low:high]]
 
+        sessions = []
+        for session_id in session_ids:
+            session = self._live_session(session_id)
+            if session:  # Skip if None (invalid data)
+                sessions.append(session)
+        return sessions
+
+    def export_stream(self, fp):
+        """
+        Write every session, archived ones included, as one JSON line each
+        (for backups, or to move to another storage with import_stream()).
+        Reads from one snapshot, so saves made meanwhile don't mix in.
+
+        :param fp: text file opened for writing
+        :return: number of sessions written
+        """
+        count = 0
+        for session_dict in self.snapshot().iter_session_dicts():
+            fp.write(json.dumps(session_dict) + "\n")
+            count += 1
         return count
 
+    def import_stream(
+        self, fp, batch_size=DEFAULT_IMPORT_BATCH, skip=0, on_commit=None
+    ):
+        """
+        Load sessions from a file written by export_stream().
+        Sessions with the same ID are replaced, version included.
+
+        Each batch is saved in one transaction. If an import stops
+        partway, call it again with skip set to the last number passed
+        to on_commit to carry on after the batches already saved.
+
+        :param fp: text file opened for reading
+        :param batch_size: sessions per transaction
+        :param skip: number of lines to skip (already imported)
+        :param on_commit: function called with the number of lines done after each batch
+        :return: number of lines done, skipped ones included
+        :raises ValueError: if a line is not a saved session
+        """
+        done = skip
+        for done, batch in import_batches(fp, batch_size, skip):
+            with self.transaction():
+                self._import_batch(batch)
+            if on_commit is not None:
+                on_commit(done)
+        return done
+
+    def _import_batch(self, session_dicts):
+        """
+        Store imported sessions as they are. Caller holds a transaction.
+
+        :param session_dicts: list of dictionaries from Session.to_dict()
+        """
+        self._ensure_index()
+        items = []
+        for session_dict in session_dicts:
+            session_id = str(session_dict["session_id"])
+            self._index_put(session_id, session_dict.get("status"))
+            created_ts = session_created_ts(session_dict)
+            if created_ts is not None:
+                self._time_index_put(session_id, created_ts)
+            self._live.pop(session_id, None)
+            items.append((session_id, session_dict))
+
+        if self.archive is not None:
+            # The imported copy replaces any archived one
+            self.archive.remove(
+                [
+                    session_id
+                    for session_id, _ in items
+                    if session_id in self.archive.entries
+                ]
+            )
+        self._write_sessions(items)
+
     def delete_session(self, session_id):
         """
         Delete a session by ID.
 
         :param session_id: the ID to delete
         """
-        data = self._load_file()
+        self.delete_sessions([session_id])
+
+    def delete_sessions(self, session_ids):
+        """
+        Delete many sessions with a single write.
+
+        :param session_ids: IDs to delete (strings or UUIDs)
+        :return: number of sessions that were deleted
+        """
+        # Convert to string in case UUID is passed
+        session_ids = [str(session_id) for session_id in session_ids]
+
+        with self._locked():
+            return self._delete_sessions(session_ids)
+
+    def _delete_sessions(self, session_ids):
+        """
+        Delete sessions by ID. Caller holds the lock.
+
+        :param session_ids: list of session ID strings
+        :return: number of sessions that were deleted
+        """
+        self._ensure_index()
+        data = self._index_data
+        existing = [session_id for session_id in session_ids if session_id in data]
+
+        for session_id in existing:
+            self._index_remove(session_id)
+            self._time_index_remove(session_id)
+            self._live.pop(session_id, None)
+        self._remove_sessions(existing)
+
+        archived = []
+        if self.archive is not None:
+            archived = self.archive.remove(session_ids)
+            for session_id in archived:
+                self._time_index_remove(session_id)
+                self._live.pop(session_id, None)
+
+        return len(existing) + len(archived)
+
+    def archive_old_sessions(self, now=None):
+        """
+        Move completed sessions older than archive_after_days into the archive.
+        Runs automatically when the storage is opened.
+
+        :param now: current time (for testing; default: datetime.now())
+        :return: number of sessions archived
+        """
+        if self.archive is None:
+            return 0
+
+        with self._locked():
+            return self._archive_old_sessions(now)
+
+    def _archive_old_sessions(self, now):
+        """
+        Archive old completed sessions. Caller holds the lock.
+
+        :param now: current time, or None for datetime.now()
+        :return: number of sessions archived
+        """
+        cutoff = (now or datetime.now()) - timedelta(days=self.archive_after_days)
+
+        self._ensure_index()
+        old_sessions = []
+        for session_id in list(self._status_index.get("completed", {})):
+            try:
+                created_at = datetime.strptime(
+                    self._session_meta(session_id).get("created_at"),
+                    CREATED_AT_FORMAT,
+                )
+            except (TypeError, ValueError):
+                continue  # Unknown age - keep it hot
+            if created_at < cutoff:
+                session_dict = self._read_session(session_id)
+                if session_dict is not None:
+                    old_sessions.append((session_id, session_dict))
+
+        if not old_sessions:
+            return 0
+
+        # Archive first (synced to disk), then drop the hot copies
+        self.archive.add(old_sessions)
+        session_ids = [session_id for session_id, _ in old_sessions]
+        for session_id in session_ids:
+            self._index_remove(session_id)
+        self._remove_sessions(session_ids)
+
+        return len(session_ids)
+
+    def delete_where(self, status):
+        """
+        Delete every session with the given status (e.g. clear history).
+
+        :param status: "in_progress", "paused", or "completed"
+        :return: number of sessions that were deleted
+        """
+        with self._locked():
+            return self._delete_sessions(self._status_ids(status))
+
+    def _sync_live(self):
+        """Forget live Session objects if another writer changed the file."""
+        if self._dirty:
+            return  # Our own unwritten changes - objects are current
+        stamp = self._file_stamp()
+        if stamp != self._live_stamp:
+            self._live = {}
+            self._live_stamp = stamp
 
-        session_id_str = str(session_id)
+    def _live_session(self, session_id):
+        """
+        Get the live Session object for an ID, building it only once.
+
+        :param session_id: session ID string
+        :return: Session object, or None if not found or data is invalid
+        """
+        self._sync_live()
+
+        session = self._live.get(session_id)
+        if session is None:
+            session_dict = self._read_session(session_id)
+            if session_dict is None and self.archive is not None:
+                session_dict = self.archive.read(session_id)
+            if session_dict is None:
+                return None
+            session = self._dict_to_session(session_dict)
+            if session:
+                self._live[session_id] = session
+        return session
+
+    def _remember_session(self, session_id, session):
+        """
+        Make a just-saved Session the live object for its ID.
+        Replaces any other copy that was handed out before.
+
+        :param session_id: session ID string
+        :param session: Session object that was saved
+        """
+        self._sync_live()
+        self._live[session_id] = session
+
+    def _read_session(self, session_id):
+        """
+        Get the full dictionary for one session.
+        Subclasses override this to change how a single read hits the disk.
+
+        :param session_id: session ID string
+        :return: dictionary from Session.to_dict(), or None if not found
+        """
+        if not self._cache_is_fresh():
+            offsets = self._fresh_offsets()
+            if offsets is not None:
+                if session_id not in offsets:
+                    return None
+                session_dict = self._read_slice(*offsets[session_id])
+                if session_dict is not None:
+                    return session_dict
+
+        return self._load_file().get(session_id)
+
+    def _fresh_offsets(self):
+        """
+        Get the byte offset index, if it matches the data file on disk.
+
+        :return: dictionary of session_id -> [offset, length], or None
+        """
+        stamp = self._file_stamp()
+        if stamp is not None and stamp == self._offsets_stamp:
+            return self._offsets
+
+        saved = self._read_index_file(stamp)
+        if saved is None or "offsets" not in saved:
+            return None
+
+        self._offsets = saved["offsets"]
+        self._offsets_stamp = stamp
+        return self._offsets
+
+    def _read_slice(self, offset, length):
+        """
+        Decode one session straight from its bytes in the data file.
+
+        :param offset: byte offset of the session's JSON
+        :param length: length in bytes
+        :return: session dictionary, or None if the file changed meanwhile
+        """
+        try:
+            with open(self.filename, "rb") as file:
+                stat = os.fstat(file.fileno())
+                if (stat.st_mtime_ns, stat.st_size, stat.st_ino) != self._offsets_stamp:
+                    return None  # Replaced since the index was read
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    return json.loads(view[offset : offset + length])
+        except (OSError, ValueError):
+            return None
+
+    def _write_session(self, session_id, session_dict):
+        """
+        Store one session dictionary under its ID.
+        Subclasses override _write_sessions() to change how writes hit the disk.
+
+        :param session_id: session ID string
+        :param session_dict: dictionary from Session.to_dict()
+        """
+        self._write_sessions([(session_id, session_dict)])
+
+    def _write_sessions(self, items):
+        """
+        Store several session dictionaries, copying the data only once.
+
+        :param items: list of (session ID string, dictionary from Session.to_dict())
+        """
+        data = dict(self._load_file())  # Copy - the old version may be in use
+        for session_id, session_dict in items:
+            data[session_id] = session_dict
+            self._changes[session_id] = session_dict
+        self._save_file(data)
+
+    def _patch_session(self, session_id, stored, patch):
+        """
+        Store only the changed fields of one session.
+        Subclasses override this to write just the change to disk;
+        here the patched session goes through _write_session().
+
+        :param session_id: session ID string
+        :param stored: the session's currently stored dictionary
+        :param patch: dictionary from Session.to_patch(), including the new version
+        """
+        self._write_session(session_id, apply_patch(stored, patch))
+
+    def _remove_sessions(self, session_ids):
+        """
+        Remove session dictionaries by ID, then save once.
+
+        :param session_ids: list of session ID strings
+        """
+        data = dict(self._load_file())  # Copy - the old version may be in use
 
-        if session_id_str in data:
-            del data[session_id_str]
+        for session_id in session_ids:
+            data.pop(session_id, None)
+            self._changes[session_id] = None
 
         self._save_file(data)
 
@@ -201,10 +1425,12 @@ class Storage:
                     description=task_dict.get("description", ""),
                     timer_minutes=task_dict.get("timer_minutes", 5),
                     status=task_dict.get("status", "pending"),
+                    started_at=task_dict.get("started_at"),
+                    finished_at=task_dict.get("finished_at"),
                 )
                 tasks.append(task)
 
-            return Session(
+            session = Session(
                 goal=session_dict.get("goal", "Unknown"),
                 time_available=session_dict.get("time_available", 60),
                 status=session_dict.get("status", "in_progress"),
@@ -212,7 +1438,11 @@ class Storage:
                 current_task=session_dict.get("current_task", 0),
                 session_id=session_dict.get("session_id"),
                 created_at=session_dict.get("created_at"),
+                version=session_dict.get("version", 0),
+                created_ts=session_dict.get("created_ts"),
             )
+            session.mark_saved()  # Matches what is stored
+            return session
         except (KeyError, TypeError, ValueError):
             # Invalid data - return None to skip this session
             return None
@@ -0,0 +1,118 @@
+"""
+storage_backend.py
+What every storage backend provides, and a factory that picks one by name.
+
+Backends (all with the methods of StorageBackend):
+    memory   MemoryStorage - nothing on disk, for tests and benchmarks
+    json     Storage - one data file (JSON or binary, see codec.py)
+    journal  JournalStorage - snapshot file plus an append-only log
+    sharded  ShardedStorage - one file per session plus a manifest
+    sqlite   SqliteStorage - SQLite tables
+
+The app uses create_storage(), so the backend is picked with the
+STORAGE_BACKEND setting in config.py.
+"""
+
+from typing import Protocol, runtime_checkable
+from config import (
+    STORAGE_ARCHIVE_AFTER_DAYS,
+    STORAGE_BACKEND,
+    STORAGE_CODEC,
+    STORAGE_DURABILITY,
+)
+from journal_storage import JournalStorage
+from memory_storage import MemoryStorage
+from sharded_storage import ShardedStorage
+from sqlite_storage import SqliteStorage
+from storage import DEFAULT_IMPORT_BATCH, Storage
+
+BACKENDS = {
+    "memory": MemoryStorage,
+    "json": Storage,
+    "journal": JournalStorage,
+    "sharded": ShardedStorage,
+    "sqlite": SqliteStorage,
+}
+
+
+@runtime_checkable
+class StorageBackend(Protocol):
+    """
+    Methods the app may call on any backend.
+    See storage.Storage for what each one does.
+    """
+
+    def save_session(self, session):
+        """Save a session; raises StorageConflictError if saved elsewhere meanwhile."""
+
+    def get_session_by_id(self, session_id):
+        """Find a session by ID, or None."""
+
+    def get_unfinished_session(self):
+        """Get the most recently saved session that is not completed, or None."""
+
+    def get_completed_sessions(self):
+        """Get all completed sessions as Session objects."""
+
+    def iter_completed(self, limit=None, offset=0, order="newest"):
+        """Page through completed sessions as SessionSummary objects."""
+
+    def get_total_completed_count(self):
+        """Count completed sessions."""
+
+    def get_sessions_between(self, start, end):
+        """Get sessions created in [start, end), oldest first."""
+
+    def delete_session(self, session_id):
+        """Delete one session."""
+
+    def delete_sessions(self, session_ids):
+        """Delete several sessions at once."""
+
+    def delete_where(self, status):
+        """Delete every session with a status."""
+
+    def snapshot(self):
+        """Get a read-only view (get_unfinished_session, iter_completed, ...)."""
+
+    def transaction(self):
+        """Context manager that groups several changes into one write."""
+
+    def flush(self):
+        """Write any deferred changes now."""
+
+    def export_stream(self, fp):
+        """Write every session as one JSON line each."""
+
+    def import_stream(
+        self, fp, batch_size=DEFAULT_IMPORT_BATCH, skip=0, on_commit=None
+    ):
+        """Load sessions written by export_stream()."""
+
+
+def create_storage(backend=None):
+    """
+    Create the storage backend chosen in config.py (or by name).
+
+    :param backend: "memory", "json", "journal", "sharded", or "sqlite"
+        (None for STORAGE_BACKEND)
+    :return: storage object with the StorageBackend methods
+    :raises ValueError: if the backend name is unknown
+    """
+    backend = backend or STORAGE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {list(BACKENDS)}, not {backend!r}")
+
+    if backend == "memory":
+        return MemoryStorage()
+    if backend == "sqlite":
+        return SqliteStorage(durability=STORAGE_DURABILITY)
+    return BACKENDS[backend](
+        durability=STORAGE_DURABILITY,
+        archive_after_days=STORAGE_ARCHIVE_AFTER_DAYS,
+        codec=STORAGE_CODEC,
+    )
+
+
+if __name__ == "__main__":
+    pass
@@ -18,8 +18,9 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
-from storage import Storage
-from ai_helper import AIHelper
+from storage import StorageConflictError
+from storage_backend import create_storage
+from ai_helper import AIHelper, InvalidGoalError
 from session import Session
 
 # PAGE CONFIG & STYLING
@@ -309,11 +310,14 @@ def set_style():
 
 # INITIALIZE SESSION STATE & SERVICES
 
+# Completed goals shown per "Show More" click on the history page
+HISTORY_PAGE_SIZE = 20
+
 
 def init_session_state():
     """Initialize all session state variables."""
     if "storage" not in st.session_state:
-        st.session_state.storage = Storage()
+        st.session_state.storage = create_storage()
 
     if "ai" not in st.session_state:
         st.session_state.ai = AIHelper()
@@ -341,6 +345,10 @@ def init_session_state():
     if "regenerate_count" not in st.session_state:
         st.session_state.regenerate_count = 0
 
+    # How many completed goals the history page currently shows
+    if "history_limit" not in st.session_state:
+        st.session_state.history_limit = HISTORY_PAGE_SIZE
+
 
 # ENCOURAGEMENT MESSAGES - shown when tasks complete
 
@@ -524,8 +532,9 @@ def render_timer(minutes, seconds, total_seconds, elapsed_seconds):
 
 def page_home():
     """Home page with main menu."""
-    # Check for unfinished session
-    unfinished = st.session_state.storage.get_unfinished_session()
+    # Check for unfinished session - read from a snapshot, so this never
+    # waits for other users' saves
+    unfinished = st.session_state.storage.snapshot().get_unfinished_session()
     render_quotes()
     st.write("")
     st.markdown("### What would you like to do?")
@@ -552,7 +561,11 @@ def page_home():
             use_container_width=True,
             key="continue_unfinished",
         ):
-            st.session_state.current_session = unfinished
+            # Continue with the live copy, not the snapshot's
+            st.session_state.current_session = (
+                st.session_state.storage.get_session_by_id(unfinished.session_id)
+                or unfinished
+            )
             st.session_state.page = "run_session"
             st.rerun()
 
@@ -620,6 +633,9 @@ def page_new_goal():
 
     st.write("")
 
+    # Steps show up here while the AI is still writing the rest
+    plan_area = st.empty()
+
     col1, col2 = st.columns([1, 1])
 
     with col1:
@@ -633,17 +649,23 @@ def page_new_goal():
                 st.error("Please enter a goal first!")
                 return
 
-            # Validate goal with AI
-            with st.spinner("Checking your goal..."):
-                if not st.session_state.ai.validate_goal(goal):
-                    st.error(
-                        "I didn't understand that. Please describe your goal more clearly."
-                    )
-                    return
-
-            # Break down the goal
-            with st.spinner("Breaking down your goal... 🤔"):
-                tasks = st.session_state.ai.break_down_goal(goal, time_available)
+            # Validate and break down the goal in one AI call, showing
+            # each step as soon as it arrives
+            tasks = []
+            try:
+                with st.spinner("Breaking down your goal... 🤔"):
+                    for task in st.session_state.ai.stream_break_down_goal(
+                        goal, time_available, validate=True
+                    ):
+                        tasks.append(task)
+                        with plan_area.container():
+                            for shown in tasks:
+                                render_task_card(shown)
+            except InvalidGoalError:
+                st.error(
+                    "I didn't understand that. Please describe your goal more clearly."
+                )
+                return
 
             if not tasks:
                 st.error(
@@ -675,9 +697,8 @@ def page_confirm_tasks():
     st.markdown(f"### 📋 Your Plan for: {session.goal}")
     st.write("")
 
-    # Calculate total time
-    total_minutes = sum(task.timer_minutes for task in session.tasks)
-    st.markdown(f"**Total time: {total_minutes} minutes**")
+    # Total time is kept up to date by the session itself
+    st.markdown(f"**Total time: {session.total_minutes} minutes**")
     st.write("")
 
     # Show all tasks
@@ -747,8 +768,13 @@ def regenerate_tasks(adjust_type, focus=None):
         return
 
     with st.spinner("Regenerating tasks... 🔄"):
+        # A regenerate asks for a new answer, so skip the cache
         tasks = st.session_state.ai.break_down_goal(
-            session.goal, session.time_available, adjust=adjust_type, focus=focus
+            session.goal,
+            session.time_available,
+            adjust=adjust_type,
+            focus=focus,
+            use_cache=False,
         )
 
     if tasks:
@@ -864,6 +890,7 @@ def page_different_focus():
                     session.time_available,
                     adjust="different_focus",
                     focus=focus,
+                    use_cache=False,
                 )
 
             if tasks:
@@ -897,8 +924,8 @@ def page_run_session():
         return
 
     # Show progress
-    total_tasks = len(session.tasks)
-    completed_tasks = sum(1 for t in session.tasks if t.status == "completed")
+    total_tasks = session.task_count
+    completed_tasks = session.completed_count
 
     st.markdown(f"### 📌 {session.goal}")
 
@@ -947,6 +974,7 @@ def page_run_session():
 
             with col1:
                 if st.button("▶️ Start Timer", use_container_width=True, type="primary"):
+                    task.start()
                     st.session_state.timer_running = True
                     st.session_state.timer_paused = False
                     st.session_state.timer_seconds = task.timer_minutes * 60
@@ -995,7 +1023,7 @@ def run_timer(task):
     total_seconds = st.session_state.current_timer_total_seconds or (
         task.timer_minutes * 60
     )
-    total_tasks = len(session.tasks)
+    total_tasks = session.task_count
 
     # Create placeholders
     timer_placeholder = st.empty()
@@ -1239,7 +1267,16 @@ def page_history():
         unsafe_allow_html=True,
     )
 
-    completed = st.session_state.storage.get_completed_sessions()
+    storage = st.session_state.storage
+    # One snapshot for the count and the list, so they agree even while
+    # other users save, and rendering never waits for their writes
+    snapshot = storage.snapshot()
+    total_completed = snapshot.get_total_completed_count()
+
+    # Only goal and date are shown, so load lightweight summaries one page at a time
+    completed = list(
+        snapshot.iter_completed(limit=st.session_state.history_limit, order="newest")
+    )
 
     if not completed:
         st.markdown(
@@ -1268,19 +1305,29 @@ def page_history():
                 unsafe_allow_html=True,
             )
 
+        if total_completed > len(completed):
+            st.write("")
+            if st.button(
+                f"Show More ({total_completed - len(completed)} left)",
+                use_container_width=True,
+            ):
+                st.session_state.history_limit += HISTORY_PAGE_SIZE
+                st.rerun()
+
     st.write("")
     st.write("")
 
     # Clear All button - only show if there are completed sessions
     if completed:
         if st.button("🗑️ Clear All", use_container_width=True):
-            # Delete all completed sessions
-            for session in completed:
-                st.session_state.storage.delete_session(session.session_id)
+            # Delete all completed sessions in one write
+            storage.delete_where(status="completed")
+            st.session_state.history_limit = HISTORY_PAGE_SIZE
             st.rerun()
         st.write("")
 
     if st.button("← Back", use_container_width=True):
+        st.session_state.history_limit = HISTORY_PAGE_SIZE
         st.session_state.page = "home"
         st.rerun()
 
@@ -1314,9 +1361,9 @@ def complete_session():
     st.write("")
 
     # Count stats
-    completed = sum(1 for t in session.tasks if t.status == "completed")
-    skipped = sum(1 for t in session.tasks if t.status == "skipped")
-    total = len(session.tasks)
+    completed = session.completed_count
+    skipped = session.skipped_count
+    total = session.task_count
 
     col1, col2 = st.columns(2)
     with col1:
@@ -1346,28 +1393,41 @@ def main():
     # Route to correct page
     page = st.session_state.page
 
-    if page == "home":
-        page_home()
-    elif page == "handle_existing":
-        page_handle_existing()
-    elif page == "new_goal":
-        page_new_goal()
-    elif page == "confirm_tasks":
-        page_confirm_tasks()
-    elif page == "adjust_time":
-        page_adjust_time()
-    elif page == "different_focus":
-        page_different_focus()
-    elif page == "run_session":
-        page_run_session()
-    elif page == "task_complete":
-        page_task_complete()
-    elif page == "extend_time":
-        page_extend_time()
-    elif page == "history":
-        page_history()
-    else:
-        page_home()
+    try:
+        if page == "home":
+            page_home()
+        elif page == "handle_existing":
+            page_handle_existing()
+        elif page == "new_goal":
+            page_new_goal()
+        elif page == "confirm_tasks":
+            page_confirm_tasks()
+        elif page == "adjust_time":
+            page_adjust_time()
+        elif page == "different_focus":
+            page_different_focus()
+        elif page == "run_session":
+            page_run_session()
+        elif page == "task_complete":
+            page_task_complete()
+        elif page == "extend_time":
+            page_extend_time()
+        elif page == "history":
+            page_history()
+        else:
+            page_home()
+    except StorageConflictError as error:
+        # Another tab or server saved this session first - switch to their copy
+        latest = st.session_state.storage.get_session_by_id(error.session_id)
+        st.session_state.current_session = latest
+        if latest is None or latest.status == "completed":
+            st.session_state.page = "home"
+        st.warning(
+            "This session was just changed in another window, so your last "
+            "change wasn't saved. Showing the latest version."
+        )
+        if st.button("OK", type="primary"):
+            st.rerun()
 
 
 if __name__ == "__main__":
@@ -4,9 +4,41 @@ task.py
 Represents one small task in a task breakdown.
 """
 
+import time
+
+# Fields saved by to_dict(). Assigning one marks it as changed.
+TASK_FIELDS = (
+    "task_number",
+    "description",
+    "timer_minutes",
+    "status",
+    "started_at",
+    "finished_at",
+)
+
 
 class Task:
-    def __init__(self, task_number, description, timer_minutes, status="pending"):
+    # No per-object __dict__ - sessions can hold many tasks
+    __slots__ = (
+        "_changed",
+        "_owner",
+        "task_number",
+        "description",
+        "timer_minutes",
+        "status",
+        "started_at",
+        "finished_at",
+    )
+
+    def __init__(
+        self,
+        task_number,
+        description,
+        timer_minutes,
+        status="pending",
+        started_at=None,
+        finished_at=None,
+    ):
         """
         Create a new task.
 
@@ -14,19 +46,62 @@ class Task:
         :param description: what to do
         :param timer_minutes: how long for this task
         :param status: "pending", "completed", or "skipped". defaults to "pending"
+        :param started_at: when the timer first started (epoch seconds), or None
+        :param finished_at: when it was completed or skipped (epoch seconds), or None
         """
+        # Names of fields changed since the last save (None: never saved)
+        self._changed = None
+        # Session whose progress counters include this task (set by Session)
+        self._owner = None
+
         self.task_number = task_number
         self.description = description
         self.timer_minutes = timer_minutes
         self.status = status
+        self.started_at = started_at
+        self.finished_at = finished_at
+
+    def __setattr__(self, name, value):
+        """
+        Record which saved fields change, so storage can write only those,
+        and keep the owning session's progress counters up to date.
+        """
+        if name in TASK_FIELDS:
+            if getattr(self, "_changed", None) is not None:
+                self._changed.add(name)
+            owner = getattr(self, "_owner", None)
+            if owner is not None:
+                owner._task_changed(name, getattr(self, name), value)
+        object.__setattr__(self, name, value)
+
+    def mark_saved(self):
+        """Forget changes - the task now matches what was saved."""
+        self._changed = set()
+
+    def get_changes(self):
+        """
+        Get the fields changed since the last save.
+
+        :return: dictionary of changed fields, or None if never saved
+        """
+        if self._changed is None:
+            return None
+        return {name: getattr(self, name) for name in self._changed}
+
+    def start(self):
+        """Record when work on the task started (the first time only)."""
+        if self.started_at is None:
+            self.started_at = int(time.time())
 
     def complete(self):
         """Mark task as completed."""
         self.status = "completed"
+        self.finished_at = int(time.time())
 
     def skip(self):
         """Mark task as skipped."""
         self.status = "skipped"
+        self.finished_at = int(time.time())
 
     def update_time(self, new_minutes):
         """
@@ -42,12 +117,18 @@ class Task:
 
         :return: dictionary with task data
         """
-        return {
+        task_dict = {
             "task_number": self.task_number,
             "description": self.description,
             "timer_minutes": self.timer_minutes,
             "status": self.status,
         }
+        # Only saved once known, so untouched tasks stay small
+        if self.started_at is not None:
+            task_dict["started_at"] = self.started_at
+        if self.finished_at is not None:
+            task_dict["finished_at"] = self.finished_at
+        return task_dict
 
 
 if __name__ == "__main__":
@@ -6,17 +6,22 @@ to run the task coaching session from start to finish.
 """
 
 from session import Session
-from storage import Storage
-from ai_helper import AIHelper
+from storage import StorageConflictError
+from storage_backend import create_storage
+from ai_helper import AIHelper, InvalidGoalError
 from timer import Timer
 from display import Display
 from input_handler import InputHandler
 
 
 class TaskCoach:
-    def __init__(self):
-        """Set up the task coach with all components."""
-        self.storage = Storage()
+    def __init__(self, storage=None):
+        """
+        Set up the task coach with all components.
+
+        :param storage: storage backend to use (None for the one chosen in config.py)
+        """
+        self.storage = storage if storage is not None else create_storage()
         self.ai = AIHelper()
         self.timer = Timer()
         self.display = Display()
@@ -53,28 +58,34 @@ class TaskCoach:
 
             choice = self.input.get_menu_choice(valid_choices)
 
-            if choice == "1":
-                if unfinished:
-                    # Ask what to do with existing session
-                    self._handle_existing_session(unfinished)
+            try:
+                if choice == "1":
+                    if unfinished:
+                        # Ask what to do with existing session
+                        self._handle_existing_session(unfinished)
+                    else:
+                        self._start_new_session()
+                elif choice == "2":
+                    self._show_history()
+                elif choice == "3" and unfinished:
+                    self._continue_session(unfinished)
+                elif choice == "q":
+                    print("See you next time!")
+                    return
                 else:
-                    self._start_new_session()
-            elif choice == "2":
-                self._show_history()
-            elif choice == "3" and unfinished:
-                self._continue_session(unfinished)
-            elif choice == "q":
-                print("See you next time!")
-                return
-            else:
-                print("Invalid choice.")
+                    print("Invalid choice.")
+                    print()
+            except StorageConflictError:
+                # Another window saved this session first - start over from the menu
+                self.current_session = None
+                print()
+                print("This session was changed in another window.")
+                print("Your last change wasn't saved. Back to the menu.")
                 print()
 
     def _show_history(self):
         """Show completed sessions."""
-        completed = self.storage.get_completed_sessions()
-
-        if not completed:
+        if self.storage.get_total_completed_count() == 0:
             print()
             print("No completed goals yet. Let's change that!")
             print()
@@ -82,11 +93,20 @@ class TaskCoach:
             print()
             print("🏆 Your Completed Goals:")
             print("-" * 30)
-            for session in completed:
+            # Summaries only - no need to load every task just to print goals
+            for session in self.storage.iter_completed(order="oldest"):
                 print(f"  ✅ {session.goal}")
             print("-" * 30)
             print()
 
+            choice = self.input.get_menu_choice(
+                ["", "c"], "Press Enter to go back, or 'c' to clear all history: "
+            )
+            if choice == "c":
+                deleted = self.storage.delete_where(status="completed")
+                print(f"Cleared {deleted} completed goal(s).")
+                print()
+
     def _handle_existing_session(self, session):
         """
         Handle existing session when user wants to start a new goal.
@@ -118,19 +138,33 @@ class TaskCoach:
         self.time_available = session.time_available
         print()
         print(f"Resuming: {session.goal}")
-        self.display.show_tasks(session.tasks)
+        self.display.show_tasks(session.tasks, session.total_minutes)
         self._run_session()
 
     def _start_new_session(self):
         """Get task from user and create new session."""
-        goal = self.input.get_goal()
+        # Checked together with the breakdown below - one AI call, not two
+        goal = self.input.get_goal(validate=False)
         self.time_available = self.input.get_time_available()
 
-        print()
-        print("Let me break that down for you...")
-        print()
+        while True:
+            print()
+            print("Let me break that down for you...")
+            print()
 
-        tasks = self.ai.break_down_goal(goal, self.time_available)
+            try:
+                # Each step is printed as soon as the AI writes it
+                tasks = self.display.show_task_stream(
+                    self.ai.stream_break_down_goal(
+                        goal, self.time_available, validate=True
+                    )
+                )
+                break
+            except InvalidGoalError:
+                print(
+                    "I didn't understand that. Please describe your goal more clearly."
+                )
+                goal = self.input.get_goal(validate=False)
 
         if not tasks:
             print(
@@ -151,7 +185,9 @@ class TaskCoach:
 
         :param regenerate_count: how many times user has regenerated
         """
-        self.display.show_tasks(self.current_session.tasks)
+        self.display.show_tasks(
+            self.current_session.tasks, self.current_session.total_minutes
+        )
 
         can_regenerate = regenerate_count < 3
         choice = self._show_confirm_menu(can_regenerate, regenerate_count)
@@ -260,8 +296,12 @@ class TaskCoach:
         print("Let me try a different approach...")
         print()
 
+        # A regenerate asks for a new answer, so skip the cache
         tasks = self.ai.break_down_goal(
-            self.current_session.goal, self.time_available, adjust=adjust_type
+            self.current_session.goal,
+            self.time_available,
+            adjust=adjust_type,
+            use_cache=False,
         )
 
         if tasks:
@@ -294,6 +334,7 @@ class TaskCoach:
             self.time_available,
             adjust="different_focus",
             focus=focus,
+            use_cache=False,
         )
 
         if tasks:
@@ -336,10 +377,8 @@ class TaskCoach:
         :return: True to continue session, False to quit
         """
         # Show current task with progress
-        total_tasks = len(self.current_session.tasks)
-        completed_tasks = sum(
-            1 for t in self.current_session.tasks if t.status == "completed"
-        )
+        total_tasks = self.current_session.task_count
+        completed_tasks = self.current_session.completed_count
         print(f"📌 Task {task.task_number} of {total_tasks}: {task.description}")
         print(f"   Time: {task.timer_minutes} minutes")
         print(f"   Progress: {completed_tasks}/{total_tasks} completed")
@@ -351,6 +390,7 @@ class TaskCoach:
         )
 
         if ready in ["yes", "y", ""]:
+            task.start()
             self.timer.start(task.timer_minutes)
             self._handle_task_completion(task)
             return True
@@ -0,0 +1,145 @@
+"""
+task_table.py
+Compact column-wise copy of the tasks of many sessions, for bulk work
+like statistics over a long history.
+
+Instead of one Task object per task, each field is one typed array:
+
+    session_ids   ["8ccacbf0-...", "8b5659e0-..."]
+    starts        [0, 3, 5]          tasks of session i are starts[i]:starts[i + 1]
+    task_numbers  [1, 2, 3, 1, 2]
+    minutes       [5, 10, 15, 20, 5]
+    statuses      [1, 1, 0, 2, 1]    codes from STATUS_CODES
+
+A task then takes 9 bytes instead of a Task object and its strings.
+Descriptions are left out on purpose.
+"""
+
+from array import array
+from task import Task
+
+# Task status <-> one-byte code
+STATUS_CODES = {"pending": 0, "completed": 1, "skipped": 2}
+STATUS_NAMES = {code: status for status, code in STATUS_CODES.items()}
+
+
+class TaskTable:
+    def __init__(self):
+        """Create an empty table."""
+        self.session_ids = []
+        self.starts = array("q", [0])
+        self.task_numbers = array("i")
+        self.minutes = array("i")
+        self.statuses = array("b")
+
+    def __len__(self):
+        """
+        Get the number of tasks in the table.
+
+        :return: task count over all sessions
+        """
+        return len(self.statuses)
+
+    def add_session(self, session):
+        """
+        Append all tasks of a Session.
+
+        :param session: Session object
+        """
+        self._add(
+            session.session_id,
+            [
+                (task.task_number, task.timer_minutes, task.status)
+                for task in session.tasks
+            ],
+        )
+
+    def add_session_dict(self, session_dict):
+        """
+        Append all tasks of a saved session, without building Task objects.
+
+        :param session_dict: dictionary from Session.to_dict()
+        """
+        self._add(
+            session_dict.get("session_id"),
+            [
+                (
+                    task_dict.get("task_number", 0),
+                    task_dict.get("timer_minutes", 0),
+                    task_dict.get("status", "pending"),
+                )
+                for task_dict in session_dict.get("tasks", [])
+            ],
+        )
+
+    def _add(self, session_id, rows):
+        """
+        Append one session's rows.
+
+        :param session_id: session ID string
+        :param rows: list of (task_number, timer_minutes, status) tuples
+        :raises ValueError: if a status is not in STATUS_CODES
+        """
+        statuses = []
+        for _, _, status in rows:
+            if status not in STATUS_CODES:
+                raise ValueError(f"Unknown task status: {status!r}")
+            statuses.append(STATUS_CODES[status])
+
+        self.session_ids.append(session_id)
+        self.task_numbers.extend(task_number for task_number, _, _ in rows)
+        self.minutes.extend(minutes for _, minutes, _ in rows)
+        self.statuses.extend(statuses)
+        self.starts.append(len(self.statuses))
+
+    def session_tasks(self, position):
+        """
+        Get where one session's tasks are in the arrays.
+
+        :param position: index of the session in session_ids
+        :return: range of task indexes
+        """
+        return range(self.starts[position], self.starts[position + 1])
+
+    def get_task(self, index):
+        """
+        Build a Task object for one row (without its description).
+
+        :param index: task index
+        :return: Task object
+        """
+        return Task(
+            self.task_numbers[index],
+            "",
+            self.minutes[index],
+            status=STATUS_NAMES[self.statuses[index]],
+        )
+
+    def count(self, status):
+        """
+        Count tasks with a status.
+
+        :param status: "pending", "completed", or "skipped"
+        :return: number of tasks
+        """
+        return self.statuses.count(STATUS_CODES[status])
+
+    def total_minutes(self, status=None):
+        """
+        Add up planned minutes.
+
+        :param status: only count tasks with this status (None for all)
+        :return: total minutes
+        """
+        if status is None:
+            return sum(self.minutes)
+        code = STATUS_CODES[status]
+        return sum(
+            minutes
+            for minutes, task_status in zip(self.minutes, self.statuses)
+            if task_status == code
+        )
+
+
+if __name__ == "__main__":
+    pass
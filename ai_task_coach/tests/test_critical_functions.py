@@ -3,21 +3,42 @@ Author: Critical Functions Test Suite
 Tests the most important functions across all modules for core functionality.
 """
 
+import asyncio
 import pytest
 import sys
 import os
 import json
 import tempfile
+import threading
+import time
 import uuid
-from unittest.mock import Mock
+from datetime import datetime
+from unittest.mock import Mock, patch
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from task import Task
+from display import Display
 from session import Session
-from storage import Storage
-from ai_helper import AIHelper
+from task_table import TaskTable
+from storage import Storage, StorageConflictError
+from journal_storage import JournalStorage
+from sqlite_storage import SqliteStorage
+from sharded_storage import ShardedStorage
+from memory_storage import MemoryStorage
+from storage_backend import StorageBackend, create_storage
+from ai_helper import AIHelper, InvalidGoalError
+from goal_classifier import GoalClassifier
+from response_cache import ResponseCache, make_key
+
+
+def remove_storage_files(filename):
+    """Delete a storage file along with the index and lock saved next to it."""
+    base = os.path.splitext(filename)[0]
+    for path in (filename, base + ".index.json", base + ".lock"):
+        if os.path.exists(path):
+            os.unlink(path)
 
 
 class TestCriticalFunctions:
@@ -120,6 +141,66 @@ class TestCriticalFunctions:
         session.complete()
         assert session.status == "completed"
 
+    def test_session_compact_fields(self):
+        """Critical: Session/Task - Slotted objects with interned IDs and epoch times."""
+        session_id = uuid.uuid4()
+        session = Session(
+            "Study math",
+            60,
+            tasks=[Task(1, "Task 1", 10)],
+            session_id=session_id,
+            created_at="2025-01-15 10:30:00",
+        )
+
+        # IDs are always strings, so str() and UUID compares aren't needed
+        assert session.session_id == str(session_id)
+        assert isinstance(session.created_ts, int)
+        assert session.created_at == "2025-01-15 10:30:00"
+        assert not hasattr(session, "__dict__")
+        assert not hasattr(session.tasks[0], "__dict__")
+
+    def test_session_progress_counters(self):
+        """Critical: Session counters - Progress kept up to date as tasks change."""
+        tasks = [Task(1, "Task 1", 10), Task(2, "Task 2", 20), Task(3, "Task 3", 15)]
+        session = Session("Study math", 60, tasks=tasks)
+        assert (session.completed_count, session.skipped_count) == (0, 0)
+        assert session.total_minutes == 45
+
+        tasks[0].complete()
+        tasks[1].skip()
+        tasks[2].update_time(25)
+        assert session.completed_count == 1
+        assert session.skipped_count == 1
+        assert session.total_minutes == 55
+
+        # Replacing the tasks recounts them
+        session.tasks = [Task(1, "New", 5, status="completed")]
+        assert (session.completed_count, session.skipped_count) == (1, 0)
+        assert session.total_minutes == 5
+        assert session.task_count == 1
+
+    def test_task_table(self):
+        """Critical: TaskTable - Column-wise tasks of many sessions."""
+        first = Session(
+            "First",
+            30,
+            tasks=[Task(1, "A", 10, status="completed"), Task(2, "B", 20)],
+        )
+        second = Session("Second", 30, tasks=[Task(1, "C", 5, status="skipped")])
+
+        table = TaskTable()
+        table.add_session(first)
+        table.add_session_dict(second.to_dict())
+
+        assert len(table) == 3
+        assert table.session_ids == [first.session_id, second.session_id]
+        assert list(table.session_tasks(1)) == [2]
+        assert table.count("completed") == 1
+        assert table.count("skipped") == 1
+        assert table.total_minutes() == 35
+        assert table.total_minutes("pending") == 20
+        assert table.get_task(1).timer_minutes == 20
+
     # From storage.py
 
     def test_storage_save_session(self):
@@ -142,7 +223,7 @@ class TestCriticalFunctions:
             assert data[str(session.session_id)]["goal"] == "Test goal"
             assert len(data[str(session.session_id)]["tasks"]) == 1
         finally:
-            os.unlink(temp_filename)
+            remove_storage_files(temp_filename)
 
     def test_storage_get_session_by_id(self):
         """Critical: Storage.get_session_by_id() - Retrieve session from storage."""
@@ -166,7 +247,7 @@ class TestCriticalFunctions:
             assert retrieved.tasks[0].description == "Task 1"
             assert retrieved.tasks[1].description == "Task 2"
         finally:
-            os.unlink(temp_filename)
+            remove_storage_files(temp_filename)
 
     def test_storage_get_unfinished_session(self):
         """Critical: Storage.get_unfinished_session() - Find paused/in-progress sessions."""
@@ -190,7 +271,7 @@ class TestCriticalFunctions:
             assert unfinished.goal == "Paused goal"
             assert unfinished.status == "paused"
         finally:
-            os.unlink(temp_filename)
+            remove_storage_files(temp_filename)
 
     def test_storage_dict_to_session(self):
         """Critical: Storage._dict_to_session() - Deserialize session from JSON."""
@@ -239,7 +320,701 @@ class TestCriticalFunctions:
             assert session.tasks[1].description == "Task 2"
             assert session.tasks[1].status == "completed"
         finally:
-            os.unlink(temp_filename)
+            remove_storage_files(temp_filename)
+
+    def test_storage_cache_skips_reparse(self):
+        """Critical: Storage._load_file() - Reuse parsed data while file is unchanged."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            temp_filename = f.name
+
+        try:
+            storage = Storage(filename=temp_filename)
+            session = Session("Cached goal", 60, status="paused")
+            storage.save_session(session)
+
+            # Reads after a write should not parse the file again
+            with patch("storage.json.load") as mock_load:
+                assert storage.get_unfinished_session().goal == "Cached goal"
+                assert storage.get_total_completed_count() == 0
+                mock_load.assert_not_called()
+        finally:
+            remove_storage_files(temp_filename)
+
+    def test_storage_cache_reloads_on_external_change(self):
+        """Critical: Storage._load_file() - Pick up changes made by another writer."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            temp_filename = f.name
+
+        try:
+            storage = Storage(filename=temp_filename)
+            assert storage.get_total_completed_count() == 0
+
+            # Another process rewrites the file behind our back
+            other = Session("Done elsewhere", 30, status="completed")
+            with open(temp_filename, "w") as f:
+                json.dump({str(other.session_id): other.to_dict()}, f)
+
+            assert storage.get_total_completed_count() == 1
+        finally:
+            remove_storage_files(temp_filename)
+
+    def test_storage_status_index(self):
+        """Critical: Storage status index - Most recent unfinished and O(1) counts."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            temp_filename = f.name
+
+        try:
+            storage = Storage(filename=temp_filename)
+            older = Session("Older goal", 60, status="paused")
+            newer = Session("Newer goal", 60, status="in_progress")
+            done = Session("Done goal", 60, status="completed")
+            for session in (older, newer, done):
+                storage.save_session(session)
+
+            assert storage.get_unfinished_session().goal == "Newer goal"
+            assert storage.get_total_completed_count() == 1
+
+            # Status changes move sessions between index buckets
+            newer.complete()
+            storage.save_session(newer)
+            assert storage.get_unfinished_session().goal == "Older goal"
+            assert storage.get_total_completed_count() == 2
+
+            storage.delete_session(done.session_id)
+            assert storage.get_total_completed_count() == 1
+
+            # A fresh handler reuses the saved index instead of rescanning
+            reopened = Storage(filename=temp_filename)
+            assert reopened._load_index_file() is not None
+            assert reopened.get_unfinished_session().goal == "Older goal"
+            assert reopened.get_total_completed_count() == 1
+        finally:
+            remove_storage_files(temp_filename)
+
+    def test_storage_offset_index_reads_one_session(self):
+        """Critical: Storage offset index - One session is read without parsing the file."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            temp_filename = f.name
+
+        try:
+            storage = Storage(filename=temp_filename)
+            sessions = [Session(f"Goal {number}", 30) for number in range(5)]
+            for session in sessions:
+                storage.save_session(session)
+
+            # The file is still plain JSON
+            with open(temp_filename, "r") as file:
+                assert len(json.load(file)) == 5
+
+            reopened = Storage(filename=temp_filename)
+            with patch.object(Storage, "_read_file", side_effect=AssertionError):
+                found = reopened.get_session_by_id(sessions[3].session_id)
+                assert reopened.get_session_by_id("missing") is None
+            assert found.goal == "Goal 3"
+            assert len(found.tasks) == len(sessions[3].tasks)
+        finally:
+            remove_storage_files(temp_filename)
+
+    def test_storage_binary_codec(self):
+        """Critical: Storage(codec="binary") - Smaller file, converted both ways on open."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "sessions.json")
+            storage = Storage(filename=filename)
+            tasks = [Task(1, "Task 1", 10, status="completed"), Task(2, "Task 2", 20)]
+            session = Session("Binary goal", 30, tasks=tasks)
+            storage.save_session(session)
+            json_size = os.path.getsize(filename)
+
+            # Opening a JSON file with the binary codec converts it
+            binary = Storage(filename=filename, codec="binary")
+            with open(filename, "rb") as file:
+                assert file.read(4) == b"\x00ATC"
+            assert os.path.getsize(filename) < json_size
+            retrieved = binary.get_session_by_id(session.session_id)
+            assert [t.status for t in retrieved.tasks] == ["completed", "pending"]
+            retrieved.tasks[1].complete()
+            binary.save_session(retrieved)
+
+            # ...and back again
+            reopened = Storage(filename=filename)
+            with open(filename) as file:
+                assert json.load(file)[session.session_id]["version"] == 2
+            assert reopened.get_session_by_id(session.session_id).completed_count == 2
+
+            journal = JournalStorage(filename=filename, codec="binary")
+            journal.compact()
+            assert Storage(filename=filename).get_unfinished_session().goal == (
+                "Binary goal"
+            )
+
+            with pytest.raises(ValueError):
+                Storage(filename=filename, codec="xml")
+
+    def test_storage_identity_map(self):
+        """Critical: Storage identity map - Repeated reads share one Session object."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            temp_filename = f.name
+
+        try:
+            storage = Storage(filename=temp_filename)
+            session = Session("Live goal", 60, status="paused")
+            storage.save_session(session)
+
+            # Reads return the object that was saved, not a new copy
+            assert storage.get_session_by_id(session.session_id) is session
+            assert storage.get_unfinished_session() is session
+
+            # A fresh handler builds the object once, then reuses it
+            reopened = Storage(filename=temp_filename)
+            first = reopened.get_session_by_id(session.session_id)
+            assert reopened.get_unfinished_session() is first
+
+            # Saving a different copy makes that copy the live one
+            copy = Session(
+                "Renamed goal",
+                60,
+                status="paused",
+                session_id=session.session_id,
+                version=first.version,
+            )
+            reopened.save_session(copy)
+            assert reopened.get_session_by_id(session.session_id) is copy
+
+            reopened.delete_session(session.session_id)
+            assert reopened.get_session_by_id(session.session_id) is None
+        finally:
+            remove_storage_files(temp_filename)
+
+    def test_storage_version_conflict(self):
+        """Critical: Storage.save_session() - A stale copy can't overwrite a newer save."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            temp_filename = f.name
+
+        try:
+            first = Storage(filename=temp_filename)
+            second = Storage(filename=temp_filename)
+            session = Session("Shared goal", 60, status="paused")
+            first.save_session(session)
+            assert session.version == 1
+
+            # Both handlers load version 1; the first save wins
+            mine = first.get_session_by_id(session.session_id)
+            theirs = second.get_session_by_id(session.session_id)
+            theirs.goal = "Their goal"
+            second.save_session(theirs)
+            assert theirs.version == 2
+
+            mine.goal = "My goal"
+            with pytest.raises(StorageConflictError):
+                first.save_session(mine)
+
+            # Their change survives, and a fresh read can be saved again
+            latest = first.get_session_by_id(session.session_id)
+            assert latest.goal == "Their goal"
+            latest.goal = "Merged goal"
+            first.save_session(latest)
+            assert second.get_session_by_id(session.session_id).goal == "Merged goal"
+        finally:
+            remove_storage_files(temp_filename)
+
+    def test_storage_iter_completed(self):
+        """Critical: Storage.iter_completed() - Page through history as summaries."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            temp_filename = f.name
+
+        try:
+            storage = Storage(filename=temp_filename)
+            for day in range(1, 6):
+                tasks = [Task(1, "Task 1", 10, status="completed")]
+                session = Session(
+                    f"Goal {day}",
+                    60,
+                    status="completed",
+                    tasks=tasks,
+                    created_at=f"2025-01-0{day} 10:00:00",
+                )
+                storage.save_session(session)
+            storage.save_session(Session("Unfinished", 60, status="paused"))
+
+            page = list(storage.iter_completed(limit=2, offset=1))
+            assert [s.goal for s in page] == ["Goal 4", "Goal 3"]
+            assert page[0].task_count == 1
+
+            oldest = list(storage.iter_completed(limit=1, order="oldest"))
+            assert oldest[0].goal == "Goal 1"
+
+            # Tasks are only loaded on demand
+            loaded = page[0].load()
+            assert loaded.tasks[0].description == "Task 1"
+
+            with pytest.raises(ValueError):
+                list(storage.iter_completed(order="random"))
+        finally:
+            remove_storage_files(temp_filename)
+
+    def test_storage_snapshot_isolation(self):
+        """Critical: Storage.snapshot() - Readers keep a consistent view while others save."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            temp_filename = f.name
+
+        try:
+            storage = Storage(filename=temp_filename)
+            first = Session("First goal", 30, status="completed")
+            second = Session("Second goal", 30, status="completed")
+            storage.save_session(first)
+            storage.save_session(second)
+
+            snapshot = storage.snapshot()
+            assert storage.snapshot() is snapshot  # Reused while nothing changes
+
+            storage.save_session(Session("Third goal", 30, status="completed"))
+            storage.delete_session(first.session_id)
+
+            # The old snapshot still sees the data it was taken from
+            assert snapshot.get_total_completed_count() == 2
+            assert {s.goal for s in snapshot.iter_completed()} == {
+                "First goal",
+                "Second goal",
+            }
+            assert snapshot.get_session_by_id(first.session_id).goal == "First goal"
+
+            latest = storage.snapshot()
+            assert latest.get_total_completed_count() == 2
+            assert {s.goal for s in latest.iter_completed()} == {
+                "Second goal",
+                "Third goal",
+            }
+
+            # While a writer holds the lock, readers get the last snapshot
+            with storage.transaction():
+                storage.save_session(Session("Fourth goal", 30, status="completed"))
+                result = []
+                reader = threading.Thread(
+                    target=lambda: result.append(storage.snapshot())
+                )
+                reader.start()
+                reader.join(timeout=5)
+                assert result == [latest]
+            assert storage.snapshot().get_total_completed_count() == 3
+        finally:
+            remove_storage_files(temp_filename)
+
+    def test_storage_get_sessions_between(self):
+        """Critical: Storage.get_sessions_between() - Time-window lookup by created time."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            temp_filename = f.name
+
+        try:
+            storage = Storage(filename=temp_filename)
+            monday = Session("Monday", 30, created_at="2025-03-03 09:00:00")
+            wednesday = Session("Wednesday", 30, created_at="2025-03-05 09:00:00")
+            for session in (wednesday, monday):
+                storage.save_session(session)
+
+            week = storage.get_sessions_between(
+                datetime(2025, 3, 3), datetime(2025, 3, 10)
+            )
+            assert [s.goal for s in week] == ["Monday", "Wednesday"]
+
+            # End is exclusive; the index follows saves and deletes
+            assert storage.get_sessions_between(
+                monday.created_ts, wednesday.created_ts
+            ) == [monday]
+            friday = Session("Friday", 30, created_at="2025-03-07 09:00:00")
+            storage.save_session(friday)
+            storage.delete_session(monday.session_id)
+            week = storage.get_sessions_between(
+                datetime(2025, 3, 3), datetime(2025, 3, 10)
+            )
+            assert [s.goal for s in week] == ["Wednesday", "Friday"]
+
+            # Task start/finish times are saved with the session
+            task = Task(1, "Timed task", 10)
+            friday.tasks = [task]
+            task.start()
+            task.complete()
+            storage.save_session(friday)
+            reopened = Storage(filename=temp_filename)
+            saved_task = reopened.get_session_by_id(friday.session_id).tasks[0]
+            assert saved_task.started_at is not None
+            assert saved_task.finished_at >= saved_task.started_at
+        finally:
+            remove_storage_files(temp_filename)
+
+    def test_storage_export_import_stream(self):
+        """Critical: export_stream()/import_stream() - JSON lines backup, batched and resumable."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = Storage(filename=os.path.join(temp_dir, "sessions.json"))
+            sessions = [
+                Session(f"Goal {n}", 30, tasks=[Task(1, f"Task {n}", 10)])
+                for n in range(3)
+            ]
+            sessions[0].complete()
+            for session in sessions:
+                storage.save_session(session)
+
+            backup = os.path.join(temp_dir, "backup.jsonl")
+            with open(backup, "w") as fp:
+                assert storage.export_stream(fp) == 3
+
+            # Into SQLite, two sessions per transaction
+            sqlite = SqliteStorage(filename=os.path.join(temp_dir, "sessions.db"))
+            commits = []
+            with open(backup) as fp:
+                assert (
+                    sqlite.import_stream(fp, batch_size=2, on_commit=commits.append)
+                    == 3
+                )
+            assert commits == [2, 3]
+            restored = sqlite.get_session_by_id(sessions[1].session_id)
+            assert restored.tasks[0].description == "Task 1"
+            assert restored.version == 1
+            assert sqlite.get_total_completed_count() == 1
+
+            # Resuming skips the lines already imported
+            copy = JournalStorage(filename=os.path.join(temp_dir, "copy.jsonl"))
+            with open(backup) as fp:
+                assert copy.import_stream(fp, skip=2) == 3
+            assert [s.goal for s in copy.get_sessions_between(0, 2**40)] == [
+                sessions[2].goal
+            ]
+            with open(backup, "w") as fp:
+                assert sqlite.export_stream(fp) == 3
+            with open(backup) as fp:
+                copy.import_stream(fp)
+            assert copy.get_total_completed_count() == 1
+            assert copy.get_session_by_id(sessions[0].session_id).status == "completed"
+            sqlite.close()
+
+            with open(backup, "a") as fp:
+                fp.write("not json\n")
+            with open(backup) as fp, pytest.raises(ValueError):
+                storage.import_stream(fp)
+
+    def test_storage_delete_sessions_single_write(self):
+        """Critical: Storage.delete_sessions()/delete_where() - Bulk delete in one write."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            temp_filename = f.name
+
+        try:
+            storage = Storage(filename=temp_filename)
+            completed = [Session(f"Done {i}", 30, status="completed") for i in range(3)]
+            paused = Session("Paused goal", 30, status="paused")
+            for session in completed + [paused]:
+                storage.save_session(session)
+
+            with patch.object(
+                storage, "_save_file", wraps=storage._save_file
+            ) as mock_save:
+                deleted = storage.delete_where(status="completed")
+                assert mock_save.call_count == 1
+
+            assert deleted == 3
+            assert storage.get_total_completed_count() == 0
+            assert storage.get_unfinished_session().goal == "Paused goal"
+
+            # Unknown IDs are ignored
+            ids = [paused.session_id, uuid.uuid4()]
+            assert storage.delete_sessions(ids) == 1
+            assert storage.get_unfinished_session() is None
+        finally:
+            remove_storage_files(temp_filename)
+
+    def test_storage_transaction_coalesces_writes(self):
+        """Critical: Storage.transaction() - Several saves become one atomic write."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "sessions.json")
+            storage = Storage(filename=filename, durability="always")
+            session = Session("Batched goal", 60, tasks=[Task(1, "Task 1", 10)])
+
+            with patch.object(
+                storage, "_write_file", wraps=storage._write_file
+            ) as mock_write:
+                with storage.transaction():
+                    storage.save_session(session)
+                    session.tasks[0].complete()
+                    session.next_task()
+                    storage.save_session(session)
+
+                    # Nothing on disk yet, but reads see the change
+                    with open(filename, "r") as f:
+                        assert json.load(f) == {}
+                    assert storage.get_total_completed_count() == 1
+
+                assert mock_write.call_count == 1
+
+            assert Storage(filename=filename).get_total_completed_count() == 1
+            # Temp files from the atomic rename are cleaned up
+            assert not [name for name in os.listdir(temp_dir) if name.endswith(".tmp")]
+
+    def test_storage_batch_durability(self):
+        """Critical: Storage durability="batch" - Writes wait for flush()."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "sessions.json")
+            storage = Storage(filename=filename, durability="batch", batch_window=60)
+
+            storage.save_session(Session("Later goal", 60, status="completed"))
+            with open(filename, "r") as f:
+                assert json.load(f) == {}
+
+            storage.flush()
+            assert Storage(filename=filename).get_total_completed_count() == 1
+
+            with pytest.raises(ValueError):
+                Storage(filename=filename, durability="sometimes")
+
+    def test_storage_archives_old_sessions(self):
+        """Critical: Storage archive tier - Old history moves out but stays readable."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "sessions.json")
+            storage = Storage(filename=filename)
+
+            old = Session(
+                "Old goal",
+                60,
+                status="completed",
+                tasks=[Task(1, "Old task", 10, status="completed")],
+                created_at="2020-01-01 09:00:00",
+            )
+            recent = Session("Recent goal", 60, status="completed")
+            for session in (old, recent):
+                storage.save_session(session)
+
+            # Reopening with archiving on moves the old session out
+            storage = Storage(filename=filename, archive_after_days=30)
+            with open(filename, "r") as f:
+                assert list(json.load(f)) == [str(recent.session_id)]
+            assert any(
+                name.endswith(".jsonl.gz")
+                for name in os.listdir(os.path.join(temp_dir, "archive"))
+            )
+
+            # History and counts still include it
+            assert storage.get_total_completed_count() == 2
+            goals = [s.goal for s in storage.iter_completed(order="oldest")]
+            assert goals == ["Old goal", "Recent goal"]
+            archived = storage.get_session_by_id(old.session_id)
+            assert archived.tasks[0].description == "Old task"
+            assert len(storage.snapshot().task_table()) == 1
+
+            assert storage.delete_where(status="completed") == 2
+            assert storage.get_total_completed_count() == 0
+            assert storage.get_session_by_id(old.session_id) is None
+
+    # From journal_storage.py
+
+    def test_journal_storage_replays_log(self):
+        """Critical: JournalStorage - Appends writes and rebuilds state on open."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "sessions.json")
+            storage = JournalStorage(filename=filename)
+
+            kept = Session("Kept goal", 60, status="paused")
+            removed = Session("Removed goal", 30, status="completed")
+            extra = Session("Extra goal", 30, status="completed")
+            storage.save_session(kept)
+            storage.save_session(removed)
+            storage.save_session(extra)
+            storage.delete_session(removed.session_id)
+            storage.delete_sessions([extra.session_id])
+
+            # Writes went to the log, not the snapshot
+            with open(filename, "r") as f:
+                assert json.load(f) == {}
+
+            # Simulate a crash in the middle of the next record
+            with open(storage.log_filename, "a") as f:
+                f.write('{"op": "put", "id": "torn')
+
+            reopened = JournalStorage(filename=filename)
+            assert reopened.get_session_by_id(kept.session_id).goal == "Kept goal"
+            assert reopened.get_session_by_id(removed.session_id) is None
+            assert reopened.get_total_completed_count() == 0
+
+    def test_journal_storage_appends_patches(self):
+        """Critical: JournalStorage - Saving a loaded session logs only what changed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "sessions.json")
+            storage = JournalStorage(filename=filename)
+
+            tasks = [Task(1, "Task 1", 10), Task(2, "Task 2", 20)]
+            session = Session("Patched goal", 30, tasks=tasks)
+            storage.save_session(session)  # New - saved whole
+            assert session.to_patch() == {"fields": {}, "tasks": {}}
+
+            session.get_current_task().complete()
+            session.next_task()
+            storage.save_session(session)
+
+            with open(storage.log_filename, "r") as f:
+                last = json.loads(f.readlines()[-1])
+            assert last["op"] == "patch"
+            assert last["patch"]["fields"] == {"current_task": 1, "version": 2}
+            assert list(last["patch"]["tasks"]) == ["0"]
+            assert last["patch"]["tasks"]["0"]["status"] == "completed"
+            assert set(last["patch"]["tasks"]["0"]) == {"status", "finished_at"}
+
+            # Replacing the tasks list saves the whole session again
+            session.tasks = [Task(1, "New task", 5)]
+            assert session.to_patch() is None
+
+            reopened = JournalStorage(filename=filename)
+            restored = reopened.get_session_by_id(session.session_id)
+            assert restored.current_task == 1
+            assert [t.status for t in restored.tasks] == ["completed", "pending"]
+            assert restored.version == 2
+
+    def test_journal_storage_compact(self):
+        """Critical: JournalStorage.compact() - Fold the log into a snapshot."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "sessions.json")
+            storage = JournalStorage(filename=filename)
+
+            session = Session("Compacted goal", 60, status="completed")
+            storage.save_session(session)
+            storage.compact()
+
+            assert os.path.getsize(storage.log_filename) == 0
+            with open(filename, "r") as f:
+                assert str(session.session_id) in json.load(f)
+            assert JournalStorage(filename=filename).get_total_completed_count() == 1
+
+    def test_journal_storage_transaction(self):
+        """Critical: JournalStorage.transaction() - Records are appended in one write."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "sessions.json")
+            storage = JournalStorage(filename=filename)
+
+            with storage.transaction():
+                for i in range(3):
+                    storage.save_session(Session(f"Goal {i}", 30, status="completed"))
+                assert not os.path.exists(storage.log_filename) or (
+                    os.path.getsize(storage.log_filename) == 0
+                )
+
+            with open(storage.log_filename, "r") as f:
+                assert len(f.readlines()) == 3
+            assert JournalStorage(filename=filename).get_total_completed_count() == 3
+
+    # From sqlite_storage.py
+
+    def test_sqlite_storage_round_trip(self):
+        """Critical: SqliteStorage - Same API as Storage backed by indexed tables."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = SqliteStorage(filename=os.path.join(temp_dir, "sessions.db"))
+
+            tasks = [Task(1, "Task 1", 10, status="completed"), Task(2, "Task 2", 20)]
+            paused = Session("Paused goal", 30, status="paused", tasks=tasks)
+            completed = Session("Completed goal", 60, status="completed")
+            storage.save_session(paused)
+            storage.save_session(completed)
+
+            retrieved = storage.get_session_by_id(paused.session_id)
+            assert retrieved.goal == "Paused goal"
+            assert [t.status for t in retrieved.tasks] == ["completed", "pending"]
+            assert storage.get_unfinished_session().goal == "Paused goal"
+
+            # Saving a loaded session updates only what changed
+            retrieved.tasks[1].complete()
+            storage.save_session(retrieved)
+            reloaded = storage.get_session_by_id(paused.session_id)
+            assert [t.status for t in reloaded.tasks] == ["completed", "completed"]
+            assert reloaded.version == retrieved.version == 2
+
+            # A copy that wasn't loaded from the database is stale
+            stale = Session("Stale goal", 30, session_id=paused.session_id)
+            with pytest.raises(StorageConflictError):
+                storage.save_session(stale)
+            assert storage.get_total_completed_count() == 1
+            assert [s.goal for s in storage.get_completed_sessions()] == [
+                "Completed goal"
+            ]
+            between = storage.get_sessions_between(0, datetime(2100, 1, 1))
+            assert {s.goal for s in between} == {"Paused goal", "Completed goal"}
+            summaries = list(storage.iter_completed(limit=10))
+            assert [s.goal for s in summaries] == ["Completed goal"]
+            assert summaries[0].load().goal == "Completed goal"
+
+            storage.delete_session(paused.session_id)
+            assert storage.get_session_by_id(paused.session_id) is None
+            assert storage.delete_where(status="completed") == 1
+            assert storage.get_total_completed_count() == 0
+            storage.close()
+
+    # From memory_storage.py / storage_backend.py
+
+    def test_memory_storage_backend(self):
+        """Critical: MemoryStorage - Storage behavior without touching the disk."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cwd = os.getcwd()
+            os.chdir(temp_dir)
+            try:
+                storage = create_storage("memory")
+                assert isinstance(storage, MemoryStorage)
+                session = Session("Memory goal", 30, tasks=[Task(1, "Task 1", 10)])
+                storage.save_session(session)
+                stale = storage.snapshot()
+
+                with storage.transaction():
+                    session.tasks[0].complete()
+                    session.complete()
+                    storage.save_session(session)
+                assert storage.get_total_completed_count() == 1
+                assert stale.get_unfinished_session().goal == "Memory goal"
+                with pytest.raises(StorageConflictError):
+                    storage.save_session(
+                        Session("Copy", 30, session_id=session.session_id)
+                    )
+                assert storage.snapshot().task_table().count("completed") == 1
+                assert os.listdir(temp_dir) == []
+
+                sqlite = SqliteStorage(filename=os.path.join(temp_dir, "sessions.db"))
+                for backend in (storage, Storage(filename="s.json"), sqlite):
+                    assert isinstance(backend, StorageBackend)
+                sqlite.save_session(Session("Done", 30, status="completed"))
+                assert sqlite.snapshot().get_total_completed_count() == 1
+                assert len(sqlite.snapshot().task_table()) == 0
+                sqlite.close()
+                with pytest.raises(ValueError):
+                    create_storage("floppy")
+            finally:
+                os.chdir(cwd)
+
+    # From sharded_storage.py
+
+    def test_sharded_storage_writes_one_file(self):
+        """Critical: ShardedStorage - A save rewrites only that session's file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            directory = os.path.join(temp_dir, "sessions")
+            storage = ShardedStorage(directory=directory)
+
+            tasks = [Task(1, "Task 1", 10), Task(2, "Task 2", 20)]
+            active = Session("Active goal", 30, tasks=tasks)
+            done = Session("Done goal", 60, status="completed")
+            storage.save_session(active)
+            storage.save_session(done)
+
+            assert os.path.exists(os.path.join(directory, f"{active.session_id}.json"))
+
+            # Progress within a session leaves the manifest alone
+            manifest = os.path.join(directory, "manifest.json")
+            before = os.stat(manifest).st_mtime_ns
+            active.tasks[0].complete()
+            active.next_task()
+            storage.save_session(active)
+            assert os.stat(manifest).st_mtime_ns == before
+
+            reopened = ShardedStorage(directory=directory)
+            assert reopened.get_session_by_id(active.session_id).current_task == 1
+            assert reopened.get_unfinished_session().goal == "Active goal"
+            summaries = list(reopened.iter_completed())
+            assert [(s.goal, s.task_count) for s in summaries] == [("Done goal", 0)]
+
+            reopened.delete_session(done.session_id)
+            assert not os.path.exists(
+                os.path.join(directory, f"{done.session_id}.json")
+            )
+            assert reopened.get_total_completed_count() == 0
 
     # From ai_helper.py
 
@@ -288,3 +1063,129 @@ class TestCriticalFunctions:
         result = helper.validate_goal("x")
         assert result is False
         assert mock_model.generate_content.call_count == 2
+
+    def test_ai_helper_response_cache(self):
+        """Critical: AIHelper + ResponseCache - Repeat breakdowns skip the AI call."""
+        mock_model = Mock()
+        mock_response = Mock()
+        mock_response.text = "1 | Open document | 5\n2 | Write intro | 10"
+        mock_model.generate_content.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ResponseCache(directory=temp_dir, max_entries=1)
+            helper = AIHelper(model=mock_model, cache=cache)
+
+            first = helper.break_down_goal("Write essay", 15)
+            again = helper.break_down_goal("  write   ESSAY ", 15)
+            assert mock_model.generate_content.call_count == 1
+            assert [t.description for t in again] == ["Open document", "Write intro"]
+            assert again[0] is not first[0]  # Fresh Task objects
+
+            # Regenerate bypasses the cache; other inputs are other keys
+            helper.break_down_goal("Write essay", 15, use_cache=False)
+            helper.break_down_goal("Write essay", 30)
+            assert mock_model.generate_content.call_count == 3
+
+            # Another process (or a restart) finds it on disk
+            other = AIHelper(model=mock_model, cache=ResponseCache(directory=temp_dir))
+            assert len(other.break_down_goal("Write essay", 15)) == 2
+            assert mock_model.generate_content.call_count == 3
+            assert other.cache.stats()["disk_hits"] == 1
+            assert cache.stats()["memory_hits"] == 1
+
+            expired = ResponseCache(directory=temp_dir, ttl=-1)
+            expired.put(make_key("Read", 10), first)
+            assert expired.get(make_key("Read", 10)) is None
+
+    def test_ai_helper_local_goal_validation(self):
+        """Critical: GoalClassifier - Obvious goals are validated without an AI call."""
+        mock_model = Mock()
+        mock_response = Mock()
+        mock_response.text = "YES"
+        mock_model.generate_content.return_value = mock_response
+        helper = AIHelper(model=mock_model, goal_classifier=GoalClassifier())
+
+        assert helper.validate_goal("Study discrete math") is True
+        assert helper.validate_goal("I need to clean the kitchen") is True
+        for gibberish in ("x", "???", "asdfgh", "aaaaaa"):
+            assert helper.validate_goal(gibberish) is False
+        mock_model.generate_content.assert_not_called()
+
+        # Unclear input asks the AI once; the answer is remembered
+        assert helper.validate_goal("quantum stuff maybe") is True
+        assert helper.validate_goal("Quantum  stuff maybe") is True
+        assert mock_model.generate_content.call_count == 1
+
+    def test_ai_helper_validate_and_break_down(self):
+        """Critical: AIHelper.validate_and_break_down() - One AI call for a new goal."""
+        mock_model = Mock()
+        mock_response = Mock()
+        mock_response.text = "1 | Open document | 5\n2 | Write intro | 10"
+        mock_model.generate_content.return_value = mock_response
+        helper = AIHelper(model=mock_model)
+
+        valid, tasks = helper.validate_and_break_down("Write essay", 20)
+        assert valid is True
+        assert [t.timer_minutes for t in tasks] == [5, 15]
+        prompt = mock_model.generate_content.call_args[0][0]
+        assert "INVALID" in prompt
+        assert mock_model.generate_content.call_count == 1
+
+        # A rejected goal isn't retried
+        mock_response.text = "INVALID"
+        assert helper.validate_and_break_down("blorp", 20) == (False, None)
+        assert mock_model.generate_content.call_count == 2
+        assert helper._parse_response("INVALID") == []
+
+    def test_ai_helper_stream_break_down_goal(self):
+        """Critical: AIHelper.stream_break_down_goal() - Yield each task as its line arrives."""
+        chunks = [
+            "1 | Open doc",
+            "ument | 5\n2 | Write",
+            " intro | 10\n3 | Edit | 1",
+            "0",
+        ]
+        mock_model = Mock()
+        mock_model.generate_content.return_value = [Mock(text=c) for c in chunks]
+        helper = AIHelper(model=mock_model)
+
+        stream = helper.stream_break_down_goal("Write essay", 30)
+        first = next(stream)
+        assert (first.task_number, first.description) == (1, "Open document")
+        tasks = [first] + list(stream)
+        assert [t.timer_minutes for t in tasks] == [5, 10, 15]  # Fitted at the end
+        assert mock_model.generate_content.call_args[1] == {"stream": True}
+
+        printed = []
+        shown = Display(print_func=printed.append).show_task_stream(iter(tasks))
+        assert shown == tasks
+        assert printed[1] == "  ⬜ Task 1: Open document (5 min)"
+
+        mock_model.generate_content.return_value = [Mock(text="INVALID\n")]
+        with pytest.raises(InvalidGoalError):
+            list(helper.stream_break_down_goal("blorp", 30, validate=True))
+
+    def test_ai_helper_hedged_request_and_deadline(self):
+        """Critical: AIHelper.abreak_down_goal() - Hedge a slow request, time out past the deadline."""
+        answer = "1 | Open document | 5\n2 | Write intro | 10"
+        calls = []
+
+        def generate(prompt):
+            calls.append(prompt)
+            if len(calls) == 1:
+                time.sleep(1)  # The first request is stuck
+            return Mock(text=answer)
+
+        mock_model = Mock()
+        mock_model.generate_content.side_effect = generate
+        helper = AIHelper(model=mock_model, deadline=5, hedge_delay=0.05)
+
+        started = time.monotonic()
+        tasks = helper.break_down_goal("Write essay", 15)
+        assert time.monotonic() - started < 0.9  # Didn't wait for the slow one
+        assert [t.description for t in tasks] == ["Open document", "Write intro"]
+        assert len(calls) == 2
+
+        mock_model.generate_content.side_effect = lambda prompt: time.sleep(1)
+        with pytest.raises(TimeoutError):
+            asyncio.run(helper.abreak_down_goal("Write essay", 15, deadline=0.1))